@@ -0,0 +1,328 @@
+# scripts/airspace3d.py
+"""Layered airspace: several altitude bands stacked over one 2D grid.
+
+Nodes are (i, j, layer). Within a layer UAVs move like on the 2D grid;
+between layers they climb or descend in place at the same cell. No-fly
+cells carry a ceiling: a cell is closed in every band at or below its
+ceiling and open above it (e.g. buildings), or closed in all bands with
+an infinite ceiling.
+
+The 3D graph is never built. The planner runs A* over the 2D grid and
+generates the vertical moves of a node only when that node is expanded.
+Its heuristic adds the exact vertical cost from a node's band to the goal
+band on top of the horizontal distance, so nodes in other bands are only
+expanded when the cheap band is blocked or reserved. A search therefore
+stays close to the size of a 2D search instead of growing with the number
+of bands.
+
+    airspace = LayeredAirspace(30, 30, altitudes=(60.0, 100.0, 140.0))
+    airspace.add_nofly_zones(percent=0.05)
+    path = airspace.plan((0, 0, 0), (20, 25, 2))
+"""
+import math
+import heapq
+import random
+import numpy as np
+import networkx as nx
+
+from simulate_uav import build_grid_graph, UAV
+from instrumentation import PROFILER
+
+DEFAULT_ALTITUDES = (60.0, 100.0, 140.0)
+
+
+class LayeredAirspace:
+    def __init__(self, rows, cols, altitudes=DEFAULT_ALTITUDES, layer_cost=None,
+                 climb_cost=1.5, descend_cost=1.0):
+        altitudes = tuple(float(a) for a in altitudes)
+        # Band index order is altitude order: ceilings, climb/descend costs and the heuristic rely on it
+        if not altitudes or altitudes[0] <= 0 or any(
+                lo >= hi for lo, hi in zip(altitudes, altitudes[1:])):
+            raise ValueError(f"Altitudes must be positive and strictly increasing, got {altitudes}")
+        if layer_cost is not None and len(layer_cost) != len(altitudes):
+            raise ValueError(f"layer_cost has {len(layer_cost)} entries for {len(altitudes)} altitudes")
+        self.rows = rows
+        self.cols = cols
+        self.G, self.pos = build_grid_graph(rows, cols)
+        self.altitudes = altitudes
+        self.layers = len(self.altitudes)
+        # Higher bands cost slightly more per hop, so UAVs only climb when it pays off
+        self.layer_cost = tuple(layer_cost) if layer_cost is not None else tuple(
+            1.0 + 0.05 * k for k in range(self.layers))
+        self.climb_cost = climb_cost
+        self.descend_cost = descend_cost
+        self.ceiling = {}            # (i, j) -> highest closed altitude
+        self.positions = _LayerPositions(self.pos)
+        # Cheapest possible grid hop, so the hop-count heuristic stays admissible
+        self._min_hop = min((d.get("weight", 1.0) for _, _, d in self.G.edges(data=True)), default=1.0)
+        self.expanded = 0            # nodes expanded by plan(), for benchmarks
+
+    # -------------------------------
+    # No-fly cells
+    # -------------------------------
+    def add_nofly(self, cell, ceiling=math.inf):
+        self.ceiling[cell] = max(ceiling, self.ceiling.get(cell, -math.inf))
+        self.G.nodes[cell]["nofly"] = True
+        self.G.nodes[cell]["ceiling"] = self.ceiling[cell]
+
+    def add_nofly_zones(self, percent=0.02, rng=random):
+        """Random no-fly cells, each closed up to a randomly chosen band."""
+        cells = list(self.G.nodes())
+        count = max(1, int(len(cells) * percent))
+        chosen = rng.sample(cells, count)
+        for cell in chosen:
+            ceiling = rng.choice(self.altitudes)
+            self.add_nofly(cell, math.inf if ceiling == self.altitudes[-1] else ceiling)
+        return chosen
+
+    def is_open(self, node):
+        i, j, layer = node
+        return self.altitudes[layer] > self.ceiling.get((i, j), -math.inf)
+
+    def free_nodes(self):
+        return [(i, j, l) for (i, j) in self.G.nodes() for l in range(self.layers)
+                if self.is_open((i, j, l))]
+
+    # -------------------------------
+    # Geometry
+    # -------------------------------
+    def altitude(self, layer):
+        return self.altitudes[layer]
+
+    def altitude_at(self, z):
+        """Altitude for a continuous layer coordinate (mid-climb positions interpolate)."""
+        z = min(max(z, 0.0), self.layers - 1)
+        lo = int(z)
+        if lo >= self.layers - 1:
+            return self.altitudes[-1]
+        frac = z - lo
+        return self.altitudes[lo] + frac * (self.altitudes[lo + 1] - self.altitudes[lo])
+
+    def neighbors(self, node):
+        """Open neighbours of a node: same-band grid moves, then climb/descend at the same cell."""
+        i, j, layer = node
+        G = self.G
+        for (a, b) in G.neighbors((i, j)):
+            nxt = (a, b, layer)
+            if self.is_open(nxt):
+                yield nxt, G[(i, j)][(a, b)].get("weight", 1.0) * self.layer_cost[layer]
+        if layer + 1 < self.layers and self.is_open((i, j, layer + 1)):
+            yield (i, j, layer + 1), self.climb_cost
+        if layer > 0 and self.is_open((i, j, layer - 1)):
+            yield (i, j, layer - 1), self.descend_cost
+
+    def to_graph(self):
+        """Materialized 3D networkx graph (for export or comparison; plan() does not need it).
+
+        Directed, because climbing and descending cost differently.
+        """
+        G3 = nx.DiGraph()
+        for node in self.free_nodes():
+            G3.add_node(node, pos=self.positions[node])
+            for nxt, cost in self.neighbors(node):
+                G3.add_edge(node, nxt, weight=cost)
+        return G3
+
+    # -------------------------------
+    # Planning
+    # -------------------------------
+    def _vertical_costs(self, goal_layer):
+        """Per-layer heuristic term: exact cost of changing band to the goal band."""
+        return [(goal_layer - l) * self.climb_cost if l < goal_layer else (l - goal_layer) * self.descend_cost
+                for l in range(self.layers)]
+
+    def plan(self, source, target, algo="astar", weight=None, avoid=()):
+        """Cheapest path from source to target as a list of (i, j, layer), or None.
+
+        weight is an optional networkx-style function (u, v, d) -> cost
+        (e.g. CongestionMap.weight_fn()) applied on top of the band costs;
+        it must not return less than d["weight"]. avoid is a set of nodes
+        to route around. algo 'dijkstra' drops the heuristic and 'bfs'
+        minimises hops.
+        """
+        with PROFILER.timer("compute_path"):
+            return self._plan(source, target, algo, weight, set(avoid))
+
+    def _plan(self, source, target, algo, weight, avoid):
+        if not self.is_open(source) or not self.is_open(target):
+            return None
+        if source == target:
+            return [source]
+        avoid.discard(source)
+        avoid.discard(target)
+
+        algo = (algo or "astar").lower()
+        hops = algo == "bfs"
+        use_h = algo == "astar"
+        ti, tj, tl = target
+        vertical = self._vertical_costs(tl)
+        h_scale = min(self.layer_cost) * self._min_hop
+
+        def h(node):
+            # 4-connected grid: at least |di| + |dj| hops, plus the exact band change
+            if not use_h:
+                return 0.0
+            return (abs(node[0] - ti) + abs(node[1] - tj)) * h_scale + vertical[node[2]]
+
+        g = {source: 0.0}
+        parent = {source: None}
+        closed = set()
+        # Ties on f go to the node closer to the goal
+        heap = [(h(source), 0.0, 0, source)]
+        tie = 1
+        while heap:
+            _, _, _, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                return path[::-1]
+            closed.add(node)
+            self.expanded += 1
+            base = g[node]
+            # Successors, vertical ones included, are generated only now that node is expanded
+            for nxt, cost in self.neighbors(node):
+                if nxt in closed or nxt in avoid:
+                    continue
+                if hops:
+                    cost = 1.0
+                elif weight is not None:
+                    cost = weight(node, nxt, {"weight": cost})
+                new_g = base + cost
+                if new_g < g.get(nxt, math.inf):
+                    g[nxt] = new_g
+                    parent[nxt] = node
+                    hn = h(nxt)
+                    heapq.heappush(heap, (new_g + hn, hn, tie, nxt))
+                    tie += 1
+        return None
+
+
+class _LayerPositions:
+    """pos lookup for (i, j, layer) nodes: grid x, y plus the band index as z."""
+
+    def __init__(self, pos):
+        self.pos = pos
+
+    def __getitem__(self, node):
+        x, y = self.pos[(node[0], node[1])]
+        return (x, y, float(node[2]))
+
+
+# -------------------------------
+# UAV in layered airspace
+# -------------------------------
+class LayeredUAV(UAV):
+    """UAV whose nodes are (i, j, layer) and whose position carries a z (band) coordinate.
+
+    Reservations key on the full 3D node, so two UAVs over the same cell in
+    different bands do not block each other.
+    """
+
+    def __init__(self, uid, start_node, goal_node, airspace, speed=1.5):
+        # G stays the 2D cell grid like any UAV's; 3D planning goes through self.airspace
+        super().__init__(uid, start_node, goal_node, airspace.positions, airspace.G, speed=speed)
+        self.airspace = airspace
+
+    @property
+    def altitude(self):
+        return self.airspace.altitude_at(float(self.pos[2]))
+
+    def compute_path(self, algo='astar', weight='weight'):
+        path = self.airspace.plan(self.cur_node, self.goal_node, algo=algo,
+                                  weight=None if isinstance(weight, str) else weight)
+        if path is None:
+            self.path_nodes = [self.cur_node]
+            self.next_node_index = 0
+            return False
+        self.path_nodes = path
+        self.next_node_index = 0
+        return True
+
+    def replan_if_stuck(self, node_reservation, wait_threshold=3, weight='weight'):
+        if self.wait_count < wait_threshold:
+            return
+        # Route around every held node, typically by changing band
+        path = self.airspace.plan(self.cur_node, self.goal_node, avoid=node_reservation.keys(),
+                                  weight=None if isinstance(weight, str) else weight)
+        if path:
+            self.path_nodes = path
+            self.next_node_index = 0
+            self.wait_count = 0
+
+
+def build_layered_fleet(num_uavs, rows=30, cols=30, altitudes=DEFAULT_ALTITUDES, nofly_percent=0.03,
+                        speed=1.2):
+    """Layered airspace plus UAVs with random start/goal nodes across all bands (uses `random`)."""
+    airspace = LayeredAirspace(rows, cols, altitudes=altitudes)
+    airspace.add_nofly_zones(percent=nofly_percent)
+    free = airspace.free_nodes()
+    starts = random.sample(free, num_uavs)
+    goals = []
+    for s in starts:
+        g = random.choice(free)
+        while g[:2] == s[:2]:
+            g = random.choice(free)
+        goals.append(g)
+    uavs = [LayeredUAV(i, starts[i], goals[i], airspace, speed=speed) for i in range(num_uavs)]
+    return airspace, uavs
+
+
+# -------------------------------
+# Entry Point: planner comparison
+# -------------------------------
+if __name__ == "__main__":
+    import time
+    import argparse
+    parser = argparse.ArgumentParser(description="Layered A* against A* without the band heuristic "
+                                                 "and against networkx on the built 3D graph")
+    parser.add_argument("--size", type=int, default=40)
+    parser.add_argument("--layers", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(7)
+    altitudes = tuple(60.0 + 40.0 * k for k in range(args.layers))
+    airspace = LayeredAirspace(args.size, args.size, altitudes=altitudes)
+    airspace.add_nofly_zones(percent=0.1)
+    free = airspace.free_nodes()
+    pairs = [tuple(random.sample(free, 2)) for _ in range(args.queries)]
+
+    def run(label):
+        airspace.expanded = 0
+        t0 = time.perf_counter()
+        paths = [airspace.plan(s, t) for s, t in pairs]
+        ms = (time.perf_counter() - t0) / len(pairs) * 1000
+        print(f"  {label:<28} {ms:7.2f} ms/query {airspace.expanded / len(pairs):8.0f} expansions/query")
+        return paths
+
+    print(f"✅ {args.size}x{args.size} grid, {args.layers} bands, {len(pairs)} queries")
+    layered = run("layered A*")
+    band_heuristic = airspace._vertical_costs
+    airspace._vertical_costs = lambda goal_layer: [0.0] * airspace.layers
+    flat_h = run("A*, horizontal heuristic")
+    airspace._vertical_costs = band_heuristic
+
+    t0 = time.perf_counter()
+    G3 = airspace.to_graph()
+    build = (time.perf_counter() - t0) * 1000
+    pos3 = airspace.positions
+    h = lambda u, v: float(np.hypot(pos3[u][0] - pos3[v][0], pos3[u][1] - pos3[v][1]))
+    t0 = time.perf_counter()
+    cost = lambda p: nx.path_weight(G3, p, "weight") if p else None
+    naive = []
+    for s, t in pairs:
+        try:
+            naive.append(nx.astar_path(G3, s, t, heuristic=h, weight="weight"))
+        except nx.NetworkXNoPath:
+            naive.append(None)
+    ms = (time.perf_counter() - t0) / len(pairs) * 1000
+    print(f"  {'networkx A* on 3D graph':<28} {ms:7.2f} ms/query  (+{build:.0f} ms to build the graph)")
+    same = sum(1 for a, b, c in zip(layered, flat_h, naive)
+               if cost(a) is None and cost(c) is None
+               or cost(a) is not None and cost(c) is not None
+               and abs(cost(a) - cost(c)) < 1e-9 and abs(cost(b) - cost(c)) < 1e-9)
+    print(f"  optimal (same cost as networkx): {same}/{len(pairs)}")
@@ -0,0 +1,176 @@
+# scripts/airspace_io.py
+"""Compact binary airspace format.
+
+A grid airspace is fully described by its dimensions, which cells are
+no-fly, which grid edges are missing and which edges differ from the
+default weight of 1.0, so that is all that gets stored:
+
+    header   magic b"UAVA", version, flags, rows, cols, overlay count
+    nofly    rows*cols bits, packed (row-major, node (i, j) -> i*cols + j)
+    absent   rows*cols bits, only when nodes were removed from the grid
+    removed  2 * rows*cols bits, only when grid edges were removed: first
+             the right edge (i, j)-(i, j+1), then the down edge (i, j)-(i+1, j)
+             of every cell
+    overlay  (u index, v index, float64 weight) per non-default or non-grid edge
+
+The payload is gzip-compressed unless export_airspace() is asked for
+compression="zstd" (needs the optional `zstandard` package) or "none".
+load_airspace() detects the codec.
+"""
+import os
+import gzip
+import struct
+import numpy as np
+
+from simulate_uav import build_grid_graph
+
+MAGIC = b"UAVA"
+VERSION = 2
+DEFAULT_WEIGHT = 1.0
+
+FLAG_ABSENT = 0x01
+FLAG_REMOVED_EDGES = 0x02
+
+_HEADER = struct.Struct("<4sBBIII")
+_OVERLAY = np.dtype([("u", "<u4"), ("v", "<u4"), ("w", "<f8")])
+_OVERLAY_V1 = np.dtype([("u", "<u4"), ("v", "<u4"), ("w", "<f4")])
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# -------------------------------
+# Encoding
+# -------------------------------
+def _grid_shape(G):
+    rows = cols = 0
+    for n in G.nodes():
+        if not (isinstance(n, tuple) and len(n) == 2):
+            raise ValueError(f"Binary airspace export needs (row, col) grid nodes, got {n!r}; "
+                             "use the JSON format instead")
+        rows = max(rows, n[0] + 1)
+        cols = max(cols, n[1] + 1)
+    return rows, cols
+
+def encode_airspace(G):
+    """Serialize a grid airspace graph to uncompressed bytes."""
+    rows, cols = _grid_shape(G)
+    size = rows * cols
+
+    nofly = np.zeros(size, dtype=bool)
+    present = np.zeros(size, dtype=bool)
+    for (i, j), data in G.nodes(data=True):
+        present[i * cols + j] = True
+        if data.get("nofly", False):
+            nofly[i * cols + j] = True
+
+    overlay = []
+    for (ui, uj), (vi, vj), data in G.edges(data=True):
+        w = data.get("weight", DEFAULT_WEIGHT)
+        grid_edge = abs(ui - vi) + abs(uj - vj) == 1
+        if w != DEFAULT_WEIGHT or not grid_edge:
+            overlay.append((ui * cols + uj, vi * cols + vj, w))
+
+    # Grid edges between two present cells that are no longer in G
+    grid = present.reshape(rows, cols)
+    right = np.zeros((rows, cols), dtype=bool)
+    down = np.zeros((rows, cols), dtype=bool)
+    right[:, :-1] = grid[:, :-1] & grid[:, 1:]
+    down[:-1, :] = grid[:-1, :] & grid[1:, :]
+    for i, j in zip(*np.nonzero(right)):
+        right[i, j] = not G.has_edge((int(i), int(j)), (int(i), int(j) + 1))
+    for i, j in zip(*np.nonzero(down)):
+        down[i, j] = not G.has_edge((int(i), int(j)), (int(i) + 1, int(j)))
+
+    flags = 0 if present.all() else FLAG_ABSENT
+    if right.any() or down.any():
+        flags |= FLAG_REMOVED_EDGES
+    parts = [_HEADER.pack(MAGIC, VERSION, flags, rows, cols, len(overlay)),
+             np.packbits(nofly).tobytes()]
+    if flags & FLAG_ABSENT:
+        parts.append(np.packbits(~present).tobytes())
+    if flags & FLAG_REMOVED_EDGES:
+        parts.append(np.packbits(np.concatenate([right.ravel(), down.ravel()])).tobytes())
+    parts.append(np.array(overlay, dtype=_OVERLAY).tobytes())
+    return b"".join(parts)
+
+def decode_airspace(payload):
+    """Rebuild (G, pos, nofly_nodes) from bytes produced by encode_airspace."""
+    magic, version, flags, rows, cols, n_overlay = _HEADER.unpack_from(payload, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary airspace file")
+    if version > VERSION:
+        raise ValueError(f"Unsupported airspace format version {version}")
+
+    size = rows * cols
+    mask_len = (size + 7) // 8
+    offset = _HEADER.size
+
+    nofly = np.unpackbits(np.frombuffer(payload, np.uint8, mask_len, offset), count=size)
+    offset += mask_len
+    absent = None
+    if flags & FLAG_ABSENT:
+        absent = np.unpackbits(np.frombuffer(payload, np.uint8, mask_len, offset), count=size)
+        offset += mask_len
+    removed = None
+    if flags & FLAG_REMOVED_EDGES:
+        removed_len = (2 * size + 7) // 8
+        removed = np.unpackbits(np.frombuffer(payload, np.uint8, removed_len, offset), count=2 * size)
+        offset += removed_len
+    overlay = np.frombuffer(payload, _OVERLAY if version >= 2 else _OVERLAY_V1, n_overlay, offset)
+
+    G, pos = build_grid_graph(rows, cols)
+    if absent is not None:
+        gone = [divmod(int(k), cols) for k in np.flatnonzero(absent)]
+        G.remove_nodes_from(gone)
+        for n in gone:
+            pos.pop(n, None)
+
+    if removed is not None:
+        right, down = removed[:size], removed[size:]
+        G.remove_edges_from([((i, j), (i, j + 1)) for i, j in
+                             (divmod(int(k), cols) for k in np.flatnonzero(right))])
+        G.remove_edges_from([((i, j), (i + 1, j)) for i, j in
+                             (divmod(int(k), cols) for k in np.flatnonzero(down))])
+
+    nofly_nodes = [divmod(int(k), cols) for k in np.flatnonzero(nofly)]
+    for n in nofly_nodes:
+        G.nodes[n]["nofly"] = True
+
+    for u, v, w in overlay:
+        G.add_edge(divmod(int(u), cols), divmod(int(v), cols), weight=float(w))
+
+    return G, pos, nofly_nodes
+
+# -------------------------------
+# Files
+# -------------------------------
+def _compress(payload, compression):
+    if compression == "gzip":
+        return gzip.compress(payload, compresslevel=6)
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=10).compress(payload)
+    if compression in (None, "none"):
+        return payload
+    raise ValueError(f"Unknown compression {compression!r} (gzip, zstd or none)")
+
+def _decompress(data):
+    if data.startswith(_GZIP_MAGIC):
+        return gzip.decompress(data)
+    if data.startswith(_ZSTD_MAGIC):
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+def export_airspace(G, filepath="graph.uava", compression="gzip"):
+    """Write G in the compact binary format. Returns the number of bytes written."""
+    data = _compress(encode_airspace(G), compression)
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    with open(filepath, "wb") as f:
+        f.write(data)
+    return len(data)
+
+def load_airspace(filepath):
+    """Load (G, pos, nofly_nodes) from a binary airspace file."""
+    with open(filepath, "rb") as f:
+        return decode_airspace(_decompress(f.read()))
@@ -0,0 +1,86 @@
+# scripts/airspace_template.py
+"""Shared base airspaces with cheap per-episode overlays.
+
+Building a grid graph and stamping `pos`/`weight` on every node and edge
+costs time proportional to the grid. A template does that once per grid
+size; each episode is an overlay holding only its no-fly cells and
+changed edge weights. Planners read through the overlay via a networkx
+restricted view and a weight function, so the template itself is never
+copied or mutated.
+
+    template = AirspaceTemplate.for_grid(30, 30)
+    episode = template.episode()
+    nofly = episode.add_random_nofly(0.06)
+    path = episode.compute_path(start, goal, algo="astar")
+"""
+import random
+import networkx as nx
+
+from simulate_uav import build_grid_graph
+from path_planning import compute_path
+
+_TEMPLATES = {}
+
+
+class AirspaceTemplate:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.G, self.pos = build_grid_graph(rows, cols)
+        # Same order as list(G.nodes()) so random draws match add_nofly_zones
+        self.nodes = list(self.G.nodes())
+
+    @classmethod
+    def for_grid(cls, rows, cols):
+        """Shared template for a grid size, built on first use."""
+        key = (rows, cols)
+        if key not in _TEMPLATES:
+            _TEMPLATES[key] = cls(rows, cols)
+        return _TEMPLATES[key]
+
+    def episode(self, nofly=(), weights=None):
+        return EpisodeOverlay(self, nofly, weights)
+
+
+class EpisodeOverlay:
+    """No-fly bits and weight overrides on top of a shared template."""
+
+    def __init__(self, template, nofly=(), weights=None):
+        self.template = template
+        self.pos = template.pos
+        self.nofly = set(nofly)
+        self.weights = {}
+        for (u, v), w in (weights or {}).items():
+            self.set_weight(u, v, w)
+        self._view = None
+
+    @property
+    def G(self):
+        """Template graph with the no-fly cells hidden (read-only view)."""
+        if self._view is None:
+            self._view = nx.restricted_view(self.template.G, self.nofly, [])
+        return self._view
+
+    def add_nofly(self, nodes):
+        self.nofly.update(nodes)
+        self._view = None
+
+    def add_random_nofly(self, percent, rng=random):
+        """Overlay counterpart of add_nofly_zones; draws the same cells for the same RNG state."""
+        count = max(1, int(len(self.template.nodes) * percent))
+        nodes = rng.sample(self.template.nodes, count)
+        self.add_nofly(nodes)
+        return list(nodes)
+
+    def set_weight(self, u, v, w):
+        self.weights[(u, v)] = w
+        self.weights[(v, u)] = w
+
+    def weight(self, u, v, d):
+        """networkx weight function: override if present, else the template weight."""
+        w = self.weights.get((u, v))
+        return d.get("weight", 1.0) if w is None else w
+
+    def compute_path(self, source, target, algo="astar"):
+        weight = self.weight if self.weights else "weight"
+        return compute_path(self.G, self.pos, source, target, algo=algo, weight=weight)
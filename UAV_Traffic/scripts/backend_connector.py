@@ -1,12 +1,11 @@
 # backend_connector.py
-import requests
 
 # Set your backend URL here
 BACKEND_URL = "http://localhost:8000/api/v1/uavs/step"
 
-def send_data_to_backend(uavs, step, nofly_nodes):
+def build_step_payload(uavs, step, nofly_nodes, include_paths=True):
     """
-    Send a simulation step to the backend including UAVs and no-fly zones.
+    Step document shared by the backend POST and the live stream server.
     """
     data = {
         "step": step,
@@ -15,14 +14,25 @@ def send_data_to_backend(uavs, step, nofly_nodes):
                 "id": u.id,
                 "x": float(u.pos[0]),
                 "y": float(u.pos[1]),
+                "altitude": float(u.altitude),
                 "start": list(u.start_node),
                 "goal": list(u.goal_node),
-                "reached": u.reached,
-                "path": [list(n) for n in u.path_nodes]
+                "reached": bool(u.reached),
             } for u in uavs
         ],
         "noFlyZones": [list(n) for n in nofly_nodes]
     }
+    if include_paths:
+        for entry, u in zip(data["uavs"], uavs):
+            entry["path"] = [list(n) for n in u.path_nodes]
+    return data
+
+def send_data_to_backend(uavs, step, nofly_nodes):
+    """
+    Send a simulation step to the backend including UAVs and no-fly zones.
+    """
+    import requests
+    data = build_step_payload(uavs, step, nofly_nodes)
 
     try:
         resp = requests.post(BACKEND_URL, json=data, timeout=5)
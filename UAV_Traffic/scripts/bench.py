@@ -0,0 +1,456 @@
+# scripts/bench.py
+"""Reproducible benchmarks for planners, simulation ticks and the data pipeline.
+
+    python bench.py run --out results/bench/base.json
+    python bench.py run --quick --only planner,tick
+    python bench.py compare results/bench/base.json results/bench/new.json --threshold 0.10
+    python bench.py startup-check --budget 1.0
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+from types import SimpleNamespace
+
+import networkx as nx
+
+from simulate_uav import build_grid_graph, run_simulation, resolve_conflicts, UAV
+from path_planning import compute_path
+from instrumentation import PROFILER
+
+RESULTS_DIR = "results"
+BENCH_DIR = os.path.join(RESULTS_DIR, "bench")
+
+SEED = 1234
+ALGOS = ["astar", "dijkstra", "bfs"]
+
+# -------------------------------
+# Helpers
+# -------------------------------
+def _percentile(values, q):
+    """Nearest-rank percentile of a non-empty list (q in [0, 100])."""
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+def _result(name, params, metric, unit, value, higher_is_better, **extra):
+    return {
+        "name": name,
+        "params": params,
+        "metric": metric,
+        "unit": unit,
+        "value": value,
+        "higher_is_better": higher_is_better,
+        "extra": extra,
+    }
+
+def _result_key(r):
+    params = ",".join(f"{k}={r['params'][k]}" for k in sorted(r["params"]))
+    return f"{r['name']}[{params}].{r['metric']}"
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+# -------------------------------
+# Scenarios
+# -------------------------------
+def bench_planner(quick=False):
+    """Per-query planner latency across grid sizes and obstacle densities."""
+    sizes = [10, 30] if quick else [10, 30, 60]
+    densities = [0.0, 0.1, 0.2]
+    queries = 20 if quick else 100
+    results = []
+
+    for size in sizes:
+        for density in densities:
+            rng = random.Random(SEED + size * 100 + int(density * 100))
+            G, pos = build_grid_graph(size, size)
+            blocked = rng.sample(list(G.nodes()), int(len(G) * density))
+            G.remove_nodes_from(blocked)
+            free = sorted(G.nodes())
+            pairs = [tuple(rng.sample(free, 2)) for _ in range(queries)]
+
+            for algo in ALGOS:
+                samples = []
+                found = 0
+                for s, g in pairs:
+                    t0 = time.perf_counter()
+                    path = compute_path(G, pos, s, g, algo=algo)
+                    samples.append((time.perf_counter() - t0) * 1000.0)
+                    found += path is not None
+                params = {"grid": size, "density": density, "algo": algo}
+                results.append(_result("planner", params, "query_p50", "ms",
+                                       statistics.median(samples), False,
+                                       p90=_percentile(samples, 90), queries=queries, found=found))
+    return results
+
+def bench_tick(quick=False):
+    """Wall time per simulation tick against fleet size.
+
+    Only the tick loop is timed (the profiler's "tick" span); grid setup and
+    the initial plans are excluded.
+    """
+    fleets = [5, 20] if quick else [5, 20, 50, 100]
+    sim_time = 10 if quick else 30
+    results = []
+
+    for n in fleets:
+        PROFILER.enable()
+        try:
+            run_simulation(num_uavs=n, dt=0.25, sim_time=sim_time, seed=SEED)
+            tick = PROFILER.summary()["timers"]["tick"]
+        finally:
+            PROFILER.disable()
+        results.append(_result("tick", {"uavs": n}, "tick_mean", "ms",
+                               tick["mean_ms"], False, ticks=tick["count"], p99=tick["p99_ms"]))
+    return results
+
+def bench_event(quick=False):
+    """Whole-run wall time of fixed-dt ticking vs the event engine on a long horizon."""
+    fleets = [5, 20] if quick else [5, 20, 60]
+    sim_time = 120 if quick else 600
+    results = []
+
+    for n in fleets:
+        for mode in ["tick", "event"]:
+            t0 = time.perf_counter()
+            snapshots = run_simulation(num_uavs=n, dt=0.25, sim_time=sim_time, seed=SEED,
+                                       rows=60, cols=60, mode=mode)
+            elapsed = time.perf_counter() - t0
+            results.append(_result("sim_run", {"uavs": n, "mode": mode, "sim_time": sim_time},
+                                   "wall", "ms", elapsed * 1000.0, False, samples=len(snapshots)))
+    return results
+
+def bench_congestion(quick=False):
+    """Fleet throughput and total wait ticks with static vs congestion-weighted costs."""
+    cases = [(20, 60)] if quick else [(15, 30), (20, 60), (30, 80)]
+    seeds = range(2 if quick else 5)
+    results = []
+
+    for grid, n in cases:
+        for congestion in [False, True]:
+            goals_per_min = wait_ticks = 0.0
+            for k in seeds:
+                stats = {}
+                run_simulation(num_uavs=n, dt=0.25, sim_time=120, seed=SEED + k, rows=grid,
+                               cols=grid, congestion=congestion, stats=stats)
+                goals_per_min += stats["goals_per_min"] / len(seeds)
+                wait_ticks += stats["wait_ticks"] / len(seeds)
+            params = {"grid": grid, "uavs": n, "congestion": congestion}
+            results.append(_result("fleet", params, "goals_per_min", "goals/min",
+                                   goals_per_min, True))
+            results.append(_result("fleet", params, "wait_ticks", "ticks", wait_ticks, False))
+    return results
+
+def bench_layers(quick=False):
+    """Fleet throughput and wait ticks with one altitude band vs several."""
+    cases = [(20, 60)] if quick else [(15, 40), (20, 60), (30, 120)]
+    bands = {1: (100.0,), 3: (60.0, 100.0, 140.0)}
+    seeds = range(2 if quick else 5)
+    results = []
+
+    for grid, n in cases:
+        for layers, altitudes in bands.items():
+            goals_per_min = wait_ticks = 0.0
+            for k in seeds:
+                stats = {}
+                run_simulation(num_uavs=n, dt=0.25, sim_time=120, seed=SEED + k, rows=grid,
+                               cols=grid, altitudes=altitudes, stats=stats)
+                goals_per_min += stats["goals_per_min"] / len(seeds)
+                wait_ticks += stats["wait_ticks"] / len(seeds)
+            params = {"grid": grid, "uavs": n, "layers": layers}
+            results.append(_result("layered_fleet", params, "goals_per_min", "goals/min",
+                                   goals_per_min, True))
+            results.append(_result("layered_fleet", params, "wait_ticks", "ticks", wait_ticks, False))
+    return results
+
+def bench_stream(quick=False):
+    """Live step fan-out: delivery latency to SSE/WebSocket clients and publish cost."""
+    from stream_server import loadtest
+    fleets = [200] if quick else [200, 1000]
+    results = []
+
+    for clients in fleets:
+        summary = loadtest(clients=clients, rate=20.0, duration=3.0 if quick else 10.0)
+        params = {"clients": clients, "rate": 20}
+        fast = summary["fast"]
+        results.append(_result("stream", params, "latency_p50", "ms", fast["latency_p50_ms"], False,
+                               connected=summary["connected"], skipped=summary["server"]["skipped"]))
+        results.append(_result("stream", params, "latency_p99", "ms", fast["latency_p99_ms"], False))
+        results.append(_result("stream", params, "publish_p50", "us", summary["publish_p50_us"], False,
+                               p99=summary["publish_p99_us"]))
+    return results
+
+def bench_resolver(quick=False):
+    """Latency of the merged_simulation conflict resolver against fleet size."""
+    fleets = [5, 20] if quick else [5, 20, 50, 100]
+    rounds = 50 if quick else 200
+    results = []
+
+    for n in fleets:
+        rng = random.Random(SEED + n)
+        G, pos = build_grid_graph(30, 30)
+        nodes = list(G.nodes())
+        starts = rng.sample(nodes, n)
+        uavs = [UAV(i, starts[i], starts[i], pos, G) for i in range(n)]
+        cur_occupancy = {u.cur_node: u.id for u in uavs}
+        priority_order = sorted(u.id for u in uavs)
+
+        samples = []
+        for _ in range(rounds):
+            # Desired moves: a random neighbour, biased into contention
+            desired = {u.id: rng.choice(list(G.neighbors(u.cur_node))) for u in uavs}
+            t0 = time.perf_counter()
+            resolve_conflicts(uavs, desired, cur_occupancy, priority_order)
+            samples.append((time.perf_counter() - t0) * 1000.0)
+        results.append(_result("resolver", {"uavs": n}, "call_p50", "ms",
+                               statistics.median(samples), False,
+                               p90=_percentile(samples, 90), rounds=rounds))
+    return results
+
+def bench_dataset(quick=False):
+    """Labelled dataset rows generated per second."""
+    from generate_dataset import label_episode
+    from airspace_template import AirspaceTemplate
+
+    episodes = 10 if quick else 50
+    results = []
+    for grid in ([10, 30] if quick else [10, 30, 60]):
+        args = SimpleNamespace(rows=grid, cols=grid, num_uavs=5, label_algo="astar")
+        random.seed(SEED)
+        rows = 0
+        t0 = time.perf_counter()
+        template = AirspaceTemplate.for_grid(args.rows, args.cols)
+        for ep in range(episodes):
+            episode = template.episode()
+            no_fly_zones = episode.add_random_nofly(0.06)
+            rows += len(label_episode(episode, no_fly_zones, ep, args))
+        elapsed = time.perf_counter() - t0
+        results.append(_result("dataset", {"episodes": episodes, "grid": grid}, "rows_per_s", "rows/s",
+                               rows / elapsed if elapsed > 0 else 0.0, True, rows=rows))
+    return results
+
+def bench_inference(quick=False):
+    """ML next-move predictions per second (skipped when no trained model exists)."""
+    try:
+        import demo
+        model, label_encoder = demo.load_model()
+    except (ImportError, FileNotFoundError) as e:
+        print(f"⚠️ Skipping inference benchmark: {e}")
+        return []
+
+    calls = 100 if quick else 500
+    rng = random.Random(SEED)
+    G, pos = build_grid_graph(30, 30)
+    nodes = list(G.nodes())
+    nofly_nodes = rng.sample(nodes, 18)
+    uavs = [UAV(i, *rng.sample(nodes, 2), pos, G) for i in range(calls)]
+
+    t0 = time.perf_counter()
+    for u in uavs:
+        demo.predict_next_move(model, label_encoder, u, u.goal_node, nofly_nodes)
+    elapsed = time.perf_counter() - t0
+    return [_result("inference", {"calls": calls}, "calls_per_s", "calls/s",
+                    calls / elapsed if elapsed > 0 else 0.0, True)]
+
+# Modules behind the CLI subcommands that must start without the ML stack
+STARTUP_TARGETS = {
+    "cli": "cli",
+    "simulate": "simulate_uav",
+    "event": "event_sim",
+    "demo": "demo",
+    "generate": "generate_dataset",
+    "bench": "bench",
+    "stream": "stream_server",
+}
+HEAVY_MODULES = ["pandas", "matplotlib", "joblib", "sklearn", "xgboost", "tqdm"]
+
+_STARTUP_PROBE = (
+    "import sys; import {module}; "
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))"
+)
+
+def measure_startup(module, repeats=3):
+    """Median wall time (seconds) of a fresh interpreter importing module,
+    plus the heavy modules that import dragged in.
+
+    Raises RuntimeError when the import itself fails.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = _STARTUP_PROBE.format(module=module, heavy=HEAVY_MODULES)
+    samples, loaded = [], []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], cwd=here,
+                             capture_output=True, text=True)
+        if out.returncode != 0:
+            lines = out.stderr.strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"import {module} failed")
+        samples.append(time.perf_counter() - t0)
+        loaded = [m for m in out.stdout.strip().split(",") if m]
+    return statistics.median(samples), loaded
+
+def bench_startup(quick=False):
+    """Fresh-process import time of each CLI entry point."""
+    results = []
+    for name, module in STARTUP_TARGETS.items():
+        seconds, loaded = measure_startup(module, repeats=1 if quick else 3)
+        results.append(_result("startup", {"target": name}, "wall", "ms",
+                               seconds * 1000.0, False, heavy_modules=loaded))
+    return results
+
+SCENARIOS = {
+    "planner": bench_planner,
+    "tick": bench_tick,
+    "event": bench_event,
+    "congestion": bench_congestion,
+    "layers": bench_layers,
+    "stream": bench_stream,
+    "resolver": bench_resolver,
+    "dataset": bench_dataset,
+    "inference": bench_inference,
+    "startup": bench_startup,
+}
+
+# -------------------------------
+# Commands
+# -------------------------------
+def run_benchmarks(args):
+    only = [s.strip() for s in args.only.split(",")] if args.only else list(SCENARIOS)
+    unknown = [s for s in only if s not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    results = []
+    for name in only:
+        print(f"🚀 Running {name} benchmark...")
+        results.extend(SCENARIOS[name](quick=args.quick))
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "networkx": nx.__version__,
+            "seed": SEED,
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+
+    out = args.out or os.path.join(BENCH_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for r in results:
+        print(f"  {_result_key(r):<60} {r['value']:>12.4f} {r['unit']}")
+    print(f"✅ Benchmark results saved to {out}")
+    return report
+
+def compare_reports(base, new, threshold):
+    """Return (rows, regressions, missing) comparing two benchmark reports.
+
+    A result regresses when it is worse than the baseline by more than threshold
+    (a fraction, so 0.10 means 10%), taking higher_is_better into account.
+    missing lists baseline metrics absent from the new report.
+    """
+    base_by_key = {_result_key(r): r for r in base["results"]}
+    new_keys = {_result_key(r) for r in new["results"]}
+    # Metrics that vanished (scenario crashed, skipped or renamed) must not pass silently
+    missing = sorted(k for k in base_by_key if k not in new_keys)
+    rows, regressions = [], []
+    for r in new["results"]:
+        key = _result_key(r)
+        b = base_by_key.get(key)
+        if b is None or not b["value"]:
+            continue
+        change = (r["value"] - b["value"]) / b["value"]
+        worse = -change if r["higher_is_better"] else change
+        row = (key, b["value"], r["value"], change, worse > threshold)
+        rows.append(row)
+        if row[-1]:
+            regressions.append(row)
+    return rows, regressions, missing
+
+def compare_benchmarks(args):
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    rows, regressions, missing = compare_reports(base, new, args.threshold)
+    for key, old, cur, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"  {key:<60} {old:>12.4f} -> {cur:>12.4f} ({change:+.1%}) {flag}")
+    for key in missing:
+        print(f"  {key:<60} {'missing from new report':>30} MISSING")
+
+    if regressions or missing:
+        print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}, "
+              f"{len(missing)} missing metric(s)")
+        return 1
+    print(f"✅ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+def startup_check(args):
+    """Fail when an ML-free entry point is slow to start or imports the ML stack."""
+    failed = 0
+    for name, module in STARTUP_TARGETS.items():
+        try:
+            seconds, loaded = measure_startup(module)
+        except RuntimeError as e:
+            failed += 1
+            print(f"  ❌ {name:<10} {e}")
+            continue
+        ok = seconds <= args.budget and not loaded
+        failed += not ok
+        note = f" (imports {', '.join(loaded)})" if loaded else ""
+        print(f"  {'✅' if ok else '❌'} {name:<10} {seconds * 1000.0:8.1f} ms{note}")
+    if failed:
+        print(f"❌ {failed} entry point(s) over the {args.budget:.2f}s startup budget")
+        return 1
+    print(f"✅ All entry points start within {args.budget:.2f}s")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="UAV simulation benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run benchmark scenarios")
+    run.add_argument("--out", type=str, default=None)
+    run.add_argument("--only", type=str, default=None,
+                     help=f"comma separated subset of: {', '.join(SCENARIOS)}")
+    run.add_argument("--quick", action="store_true", help="smaller sizes for a fast smoke run")
+    run.set_defaults(func=run_benchmarks)
+
+    cmp_ = sub.add_parser("compare", help="flag regressions between two runs")
+    cmp_.add_argument("base", type=str)
+    cmp_.add_argument("new", type=str)
+    cmp_.add_argument("--threshold", type=float, default=0.10)
+    cmp_.set_defaults(func=compare_benchmarks)
+
+    chk = sub.add_parser("startup-check", help="fail if ML-free entry points start slowly")
+    chk.add_argument("--budget", type=float, default=1.0, help="seconds per entry point")
+    chk.set_defaults(func=startup_check)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    status = args.func(args)
+    return status if isinstance(status, int) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
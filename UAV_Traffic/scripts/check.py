@@ -1,4 +1,4 @@
-from demo import build_grid_graph
+from simulate_uav import build_grid_graph
 
 graph,pos=build_grid_graph(30,30)
 print(list(graph.nodes())[:10])
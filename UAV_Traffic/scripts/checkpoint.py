@@ -0,0 +1,296 @@
+# scripts/checkpoint.py
+"""Checkpoint, resume and fork for run_simulation.
+
+A checkpoint is a compressed .npz holding the whole simulation state:
+
+    airspace   compact airspace bytes (see airspace_io), incl. no-fly cells
+    uavs       one fixed-layout record per UAV (nodes, position, cursor, waits)
+    paths      remaining path nodes (from the cursor on) back to back, with per-UAV offsets
+    trajectory all trajectory points back to back, with per-UAV offsets
+    rng        the `random` module state
+    congestion decayed node/edge demand, when congestion-aware planning is on
+    meta       JSON with the step counter and run parameters
+
+Capturing the state on the simulation thread only copies the per-UAV
+records, the RNG and the congestion map, and notes each UAV's path and
+trajectory length; paths and trajectories are only appended to or
+replaced, never edited in place, so the background thread flattens them
+up to those marks. Compression and the disk write happen there too, and
+the file is swapped in atomically so a crash never leaves a torn checkpoint.
+
+    python checkpoint.py resume results/run.ckpt.npz
+    python checkpoint.py fork results/run.ckpt.npz --variant algo=dijkstra --variant nofly=0.05
+"""
+import io
+import os
+import json
+import random
+import argparse
+import threading
+import numpy as np
+import networkx as nx
+
+from airspace_io import encode_airspace, decode_airspace
+from simulate_uav import UAV, run_ticks
+from congestion import CongestionMap
+
+FORMAT_VERSION = 2
+
+UAV_DTYPE = np.dtype([
+    ("id", "<i4"),
+    ("start", "<i4", (2,)),
+    ("goal", "<i4", (2,)),
+    ("cur", "<i4", (2,)),
+    ("speed", "<f8"),
+    ("pos", "<f8", (2,)),
+    ("next_node_index", "<i4"),
+    ("wait_count", "<i4"),
+    ("reached", "u1"),
+    ("total_wait", "<i4"),
+])
+
+
+class SimState:
+    """Everything needed to continue a run_simulation loop."""
+
+    def __init__(self, G, pos, uavs, step, params, rng_state, cmap=None):
+        self.G = G
+        self.pos = pos
+        self.uavs = uavs
+        self.step = step
+        self.params = params
+        self.rng_state = rng_state
+        self.cmap = cmap
+
+
+# -------------------------------
+# Capture / restore
+# -------------------------------
+def _flatten(seqs, width, dtype):
+    offsets = np.zeros(len(seqs) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(s) for s in seqs])
+    flat = np.asarray([p for s in seqs for p in s], dtype=dtype).reshape(-1, width)
+    return flat, offsets
+
+def capture_state(step, G, uavs, params, cmap=None):
+    """Snapshot the live state; O(uavs) on the calling thread, histories are packed later.
+
+    The result holds references to each UAV's path and trajectory lists plus
+    the cursor/length to cut them at; pass it to pack_state (or write_state),
+    possibly on another thread.
+    """
+    records = np.zeros(len(uavs), dtype=UAV_DTYPE)
+    for k, u in enumerate(uavs):
+        # Only the path ahead of the cursor is stored, so the cursor restarts at 0
+        records[k] = (u.id, u.start_node, u.goal_node, u.cur_node, u.speed, u.pos,
+                      0, u.wait_count, u.reached, u.total_wait)
+
+    version, internal, gauss_next = random.getstate()
+    meta = {
+        "format": FORMAT_VERSION,
+        "step": step,
+        "params": params,
+        "rng_version": version,
+        "rng_gauss_next": gauss_next,
+    }
+    arrays = {
+        "meta": np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+        "airspace": np.frombuffer(encode_airspace(G), dtype=np.uint8),
+        "uavs": records,
+        "rng": np.asarray(internal, dtype=np.uint64),
+    }
+    if cmap is not None:
+        (arrays["cong_nodes"], arrays["cong_node_demand"],
+         arrays["cong_edges"], arrays["cong_edge_demand"]) = cmap.to_arrays()
+    return {
+        "arrays": arrays,
+        "paths": [(u.path_nodes, u.next_node_index) for u in uavs],
+        "trajectories": [(u.trajectory, len(u.trajectory)) for u in uavs],
+    }
+
+def pack_state(captured):
+    """Flatten the paths and trajectories of a captured state into its arrays."""
+    arrays = dict(captured["arrays"])
+    arrays["paths"], arrays["path_offsets"] = _flatten(
+        [nodes[cursor:] for nodes, cursor in captured["paths"]], 2, np.int32)
+    arrays["trajectory"], arrays["trajectory_offsets"] = _flatten(
+        [points[:n] for points, n in captured["trajectories"]], 2, np.float64)
+    return arrays
+
+def write_state(filepath, captured):
+    """Pack, compress and atomically write a captured state."""
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **pack_state(captured))
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    tmp = filepath + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(buf.getbuffer())
+    os.replace(tmp, filepath)
+
+def save_checkpoint(filepath, step, G, uavs, params, cmap=None):
+    write_state(filepath, capture_state(step, G, uavs, params, cmap))
+
+def load_checkpoint(filepath):
+    """Rebuild a SimState (graph, UAVs, step, params, RNG state) from a checkpoint."""
+    with np.load(filepath) as data:
+        meta = json.loads(data["meta"].tobytes().decode())
+        if meta["format"] > FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint format {meta['format']}")
+        G, pos, nofly_nodes = decode_airspace(data["airspace"].tobytes())
+        records = data["uavs"]
+        paths, path_offsets = data["paths"], data["path_offsets"]
+        traj, traj_offsets = data["trajectory"], data["trajectory_offsets"]
+        rng_internal = tuple(int(x) for x in data["rng"])
+        cmap = None
+        if "cong_nodes" in data.files:
+            cmap = CongestionMap.from_arrays(data["cong_nodes"], data["cong_node_demand"],
+                                             data["cong_edges"], data["cong_edge_demand"])
+
+    # UAVs plan on the airspace minus its no-fly cells
+    plan_graph = nx.restricted_view(G, nofly_nodes, []) if nofly_nodes else G
+    uavs = []
+    for k, r in enumerate(records):
+        u = UAV(int(r["id"]), tuple(int(x) for x in r["start"]), tuple(int(x) for x in r["goal"]),
+                pos, plan_graph, speed=float(r["speed"]))
+        u.cur_node = tuple(int(x) for x in r["cur"])
+        u.pos = np.array(r["pos"], dtype=float)
+        u.next_node_index = int(r["next_node_index"])
+        u.wait_count = int(r["wait_count"])
+        u.reached = bool(r["reached"])
+        if "total_wait" in records.dtype.names:
+            u.total_wait = int(r["total_wait"])
+        u.path_nodes = [tuple(int(x) for x in p) for p in paths[path_offsets[k]:path_offsets[k + 1]]]
+        u.trajectory = [tuple(float(x) for x in p) for p in traj[traj_offsets[k]:traj_offsets[k + 1]]]
+        uavs.append(u)
+
+    rng_state = (meta["rng_version"], rng_internal, meta["rng_gauss_next"])
+    return SimState(G, pos, uavs, meta["step"], meta["params"], rng_state, cmap)
+
+
+class Checkpointer:
+    """Saves the state every `every` ticks without blocking the simulation on disk I/O."""
+
+    def __init__(self, filepath, every):
+        self.filepath = filepath
+        self.every = every
+        self._thread = None
+
+    def maybe_save(self, step, G, uavs, params, cmap=None):
+        if (step + 1) % self.every:
+            return
+        captured = capture_state(step, G, uavs, params, cmap)
+        if self._thread is not None:
+            # Previous write is normally long done; never keep two in flight
+            self._thread.join()
+        self._thread = threading.Thread(target=write_state, args=(self.filepath, captured),
+                                        daemon=True)
+        self._thread.start()
+
+    def close(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# -------------------------------
+# Fork
+# -------------------------------
+def apply_variant(state, variant):
+    """Modify a loaded state in place: planner, extra no-fly cells, horizon."""
+    params = dict(state.params)
+    if "seed" in variant:
+        random.seed(variant["seed"])
+    else:
+        random.setstate(state.rng_state)
+
+    if variant.get("nofly"):
+        occupied = {u.cur_node for u in state.uavs} | {u.goal_node for u in state.uavs}
+        free = [n for n in state.G.nodes() if n not in occupied and not state.G.nodes[n].get("nofly")]
+        count = max(1, int(len(state.G) * float(variant["nofly"])))
+        for n in random.sample(free, min(count, len(free))):
+            state.G.nodes[n]["nofly"] = True
+
+    if "algo" in variant:
+        params["planner_algo"] = variant["algo"]
+    if "sim_time" in variant:
+        params["sim_time"] = float(variant["sim_time"])
+
+    if "congestion" in variant:
+        params["congestion"] = variant["congestion"] in (True, "1", "true", "yes")
+        if not params["congestion"]:
+            state.cmap = None
+
+    if variant.get("nofly") or "algo" in variant:
+        nofly_nodes = [n for n in state.G.nodes() if state.G.nodes[n].get("nofly")]
+        plan_graph = nx.restricted_view(state.G, nofly_nodes, [])
+        for u in state.uavs:
+            u.G = plan_graph
+            if not u.reached:
+                u.compute_path(algo=params["planner_algo"])
+    state.params = params
+    return state
+
+def _run_variant(job):
+    filepath, variant = job
+    state = apply_variant(load_checkpoint(filepath), variant)
+    snapshots = run_ticks(state.G, state.uavs, state.params, start_step=state.step + 1,
+                          cmap=state.cmap)
+    return {
+        "variant": variant,
+        "ticks": len(snapshots),
+        "reached": sum(1 for u in state.uavs if u.reached),
+        "uavs": len(state.uavs),
+        "wait_ticks": sum(u.total_wait for u in state.uavs),
+    }
+
+def fork_from_checkpoint(filepath, variants, processes=None):
+    """Run each variant dict from the same checkpoint in parallel; returns one summary per variant."""
+    from multiprocessing import Pool
+    jobs = [(filepath, v) for v in variants]
+    if processes == 1 or len(jobs) == 1:
+        return [_run_variant(j) for j in jobs]
+    with Pool(processes=processes) as pool:
+        return pool.map(_run_variant, jobs)
+
+def _parse_variant(text):
+    """'algo=dijkstra,nofly=0.05' -> {'algo': 'dijkstra', 'nofly': 0.05}"""
+    variant = {}
+    for item in text.split(","):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key in ("nofly", "sim_time"):
+            variant[key] = float(value)
+        elif key == "seed":
+            variant[key] = int(value)
+        else:
+            variant[key] = value.strip()
+    return variant
+
+
+# -------------------------------
+# Entry Point
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume or fork a checkpointed simulation")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    res = sub.add_parser("resume")
+    res.add_argument("checkpoint", type=str)
+
+    fork = sub.add_parser("fork")
+    fork.add_argument("checkpoint", type=str)
+    fork.add_argument("--variant", action="append", default=[],
+                      help="comma separated key=value (algo, nofly, seed, sim_time, congestion); "
+                           "repeatable")
+    fork.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "resume":
+        from simulate_uav import run_simulation
+        snaps = run_simulation(resume_from=args.checkpoint)
+        print(f"✅ Resumed run finished after {len(snaps)} more ticks")
+    else:
+        variants = [_parse_variant(v) for v in args.variant] or [{}]
+        for summary in fork_from_checkpoint(args.checkpoint, variants, processes=args.processes):
+            print(f"  {summary['variant']}: {summary['reached']}/{summary['uavs']} reached "
+                  f"in {summary['ticks']} ticks, {summary['wait_ticks']} wait ticks")
@@ -0,0 +1,218 @@
+# scripts/cli.py
+"""Single entry point for the simulation scripts.
+
+    python cli.py simulate --uavs 20 --mode event
+    python cli.py demo --seed 7 --no-visualize
+    python cli.py generate --episodes 200
+    python cli.py train
+    python cli.py bench run --quick
+
+Subcommands import their modules only when they run, so commands that do
+not need the ML model never load pandas, joblib or the pickled model.
+"""
+import sys
+import json
+import argparse
+
+# -------------------------------
+# Subcommands
+# -------------------------------
+class _FeedFanout:
+    """Publishes each tick to several feeds (shm ring and/or stream server)."""
+
+    def __init__(self, feeds):
+        self.feeds = feeds
+
+    def publish(self, *args, **kwargs):
+        for feed in self.feeds:
+            feed.publish(*args, **kwargs)
+
+    def close(self):
+        for feed in self.feeds:
+            feed.close()
+
+def _open_stream(port, host="127.0.0.1", cors_origin=None):
+    if port is None:
+        return None
+    from stream_server import StepStreamServer, CORS_ORIGIN
+    server = StepStreamServer(host=host, port=port,
+                              cors_origin=cors_origin or CORS_ORIGIN).start_in_thread()
+    print(f"🚀 Streaming steps on http://{host}:{server.port}/stream and ws://{host}:{server.port}/ws")
+    return server
+
+def _open_feed(name, stream=None, max_uavs=256, replace=False):
+    feeds = []
+    if name:
+        from shm_feed import FleetFeedWriter
+        try:
+            feeds.append(FleetFeedWriter(name, max_uavs=max(256, max_uavs), replace=replace))
+        except FileExistsError as e:
+            if stream is not None:
+                stream.close()
+            raise SystemExit(f"❌ {e} (use --replace-feed)")
+    if stream is not None:
+        feeds.append(stream)
+    if not feeds:
+        return None
+    return feeds[0] if len(feeds) == 1 else _FeedFanout(feeds)
+
+def _simulate(argv):
+    parser = argparse.ArgumentParser(prog="cli.py simulate",
+                                     description="Planner-driven simulation (no ML model needed)")
+    parser.add_argument("--uavs", type=int, default=7)
+    parser.add_argument("--dt", type=float, default=0.25)
+    parser.add_argument("--sim-time", type=float, default=60)
+    parser.add_argument("--algo", type=str, default="astar", choices=["astar", "dijkstra", "bfs"])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mode", type=str, default="tick", choices=["tick", "event"],
+                        help="event: discrete-event engine; faster only for large fleets and "
+                             "its snapshot counts and wait totals differ from tick mode")
+    parser.add_argument("--profile", action="store_true", help="print per-phase timings")
+    parser.add_argument("--out", type=str, default=None, help="write snapshots as JSON")
+    parser.add_argument("--feed", type=str, default=None,
+                        help="publish every tick to this shared-memory feed")
+    parser.add_argument("--replace-feed", action="store_true",
+                        help="take over an existing feed segment (e.g. left by a crashed run)")
+    parser.add_argument("--stream", type=int, default=None, metavar="PORT",
+                        help="serve live steps over SSE/WebSocket on this port")
+    parser.add_argument("--stream-host", type=str, default="127.0.0.1",
+                        help="interface the stream server listens on")
+    parser.add_argument("--cors-origin", type=str, default=None,
+                        help="Access-Control-Allow-Origin for the stream "
+                             "(default http://localhost:5173)")
+    parser.add_argument("--checkpoint", type=str, default=None, help="checkpoint file (.npz)")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="ticks between checkpoints")
+    parser.add_argument("--resume", type=str, default=None, help="continue from a checkpoint")
+    parser.add_argument("--congestion", action="store_true",
+                        help="plan with congestion-weighted edge costs (initial routes and "
+                             "replans of stuck UAVs; UAVs that are moving keep their route)")
+    parser.add_argument("--altitudes", type=str, default=None, metavar="A,B,...",
+                        help="fly in layered airspace, one band per altitude (e.g. 60,100,140)")
+    args = parser.parse_args(argv)
+    if args.mode == "event" and (args.checkpoint or args.resume):
+        parser.error("--checkpoint and --resume are only supported with --mode tick")
+    if args.mode == "event" and args.congestion:
+        parser.error("--congestion is only supported with --mode tick")
+    altitudes = tuple(float(a) for a in args.altitudes.split(",")) if args.altitudes else None
+    if altitudes is not None and (altitudes[0] <= 0 or list(altitudes) != sorted(set(altitudes))):
+        parser.error("--altitudes must be positive and strictly increasing, e.g. 60,100,140")
+
+    from simulate_uav import run_simulation
+    from instrumentation import PROFILER
+
+    if args.profile:
+        PROFILER.enable()
+    stream = _open_stream(args.stream, args.stream_host, args.cors_origin)
+    feed = _open_feed(args.feed, stream, max_uavs=args.uavs, replace=args.replace_feed)
+    stats = {}
+    try:
+        snapshots = run_simulation(num_uavs=args.uavs, dt=args.dt, sim_time=args.sim_time,
+                                   planner_algo=args.algo, seed=args.seed, rows=args.rows,
+                                   cols=args.cols, mode=args.mode, feed=feed,
+                                   checkpoint_path=args.checkpoint,
+                                   checkpoint_every=args.checkpoint_every if args.checkpoint else 0,
+                                   resume_from=args.resume, congestion=args.congestion,
+                                   stats=stats, altitudes=altitudes)
+    finally:
+        if feed is not None:
+            feed.close()
+    if stats:
+        print(f"✅ {len(snapshots)} snapshots, {stats['reached']}/{stats['uavs']} UAVs reached their goal, "
+              f"{stats['goals_per_min']:.1f} goals/min, {stats['wait_ticks']} wait ticks")
+    else:
+        fleet = len(snapshots[-1]) if snapshots else 0
+        reached = sum(1 for s in snapshots[-1] if s["status"] == "idle") if snapshots else 0
+        print(f"✅ {len(snapshots)} snapshots, {reached}/{fleet} UAVs reached their goal")
+    if args.profile:
+        print(PROFILER.format_summary())
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(snapshots, f)
+        print(f"Saved snapshots to {args.out}")
+    return 0
+
+def _demo(argv):
+    parser = argparse.ArgumentParser(prog="cli.py demo",
+                                     description="ML-driven simulation with live view and backend feed")
+    parser.add_argument("--uavs", type=int, default=7)
+    parser.add_argument("--dt", type=float, default=0.25)
+    parser.add_argument("--sim-time", type=float, default=60)
+    parser.add_argument("--algo", type=str, default="astar", choices=["astar", "dijkstra", "bfs"])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-visualize", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--trace", action="store_true", help="also write a trace-event file")
+    parser.add_argument("--record", type=str, default=None, help="export the live view to a video")
+    parser.add_argument("--no-backend", action="store_true",
+                        help="do not POST every step to the backend (use --stream instead)")
+    parser.add_argument("--graph-format", type=str, default="json", choices=["json", "binary"],
+                        help="results/graph.json, or the compact results/graph.uava")
+    parser.add_argument("--feed", type=str, default=None,
+                        help="publish every tick to this shared-memory feed")
+    parser.add_argument("--replace-feed", action="store_true",
+                        help="take over an existing feed segment (e.g. left by a crashed run)")
+    parser.add_argument("--stream", type=int, default=None, metavar="PORT",
+                        help="serve live steps over SSE/WebSocket on this port")
+    parser.add_argument("--stream-host", type=str, default="127.0.0.1",
+                        help="interface the stream server listens on")
+    parser.add_argument("--cors-origin", type=str, default=None,
+                        help="Access-Control-Allow-Origin for the stream "
+                             "(default http://localhost:5173)")
+    args = parser.parse_args(argv)
+
+    from demo import merged_simulation
+    feed = _open_feed(args.feed, max_uavs=args.uavs, replace=args.replace_feed)
+    stream = _open_stream(args.stream, args.stream_host, args.cors_origin)
+    try:
+        merged_simulation(num_uavs=args.uavs, dt=args.dt, sim_time=args.sim_time,
+                          planner_algo=args.algo, seed=args.seed, visualize=not args.no_visualize,
+                          profile=args.profile, trace=args.trace, record_path=args.record,
+                          feed=feed, stream=stream, backend=not args.no_backend,
+                          graph_format=args.graph_format)
+    finally:
+        if feed is not None:
+            feed.close()
+        if stream is not None:
+            stream.close()
+    print("🎯 Simulation completed successfully.")
+    return 0
+
+def _generate(argv):
+    from generate_dataset import main
+    main(argv)
+    return 0
+
+def _train(argv):
+    from train_ml_model import main
+    main(argv)
+    return 0
+
+def _bench(argv):
+    from bench import main
+    return main(argv)
+
+COMMANDS = {
+    "simulate": (_simulate, "planner-driven simulation, tick or event mode"),
+    "demo": (_demo, "ML-driven merged simulation (needs a trained model)"),
+    "generate": (_generate, "generate the training dataset"),
+    "train": (_train, "train the XGBoost next-move model"),
+    "bench": (_bench, "run or compare benchmarks"),
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + "\n".join(f"  {name:<10} {desc}" for name, (_, desc) in COMMANDS.items()),
+    )
+    parser.add_argument("command", choices=COMMANDS, metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the command")
+    args = parser.parse_args(argv)
+    return COMMANDS[args.command][0](args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
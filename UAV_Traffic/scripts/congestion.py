@@ -0,0 +1,111 @@
+# scripts/congestion.py
+"""Decayed fleet demand per node and edge, for congestion-aware planning.
+
+Every tick each flying UAV adds demand to the node it holds and to the next
+`lookahead` nodes/edges of its planned path (nearer hops count more). Old
+demand decays geometrically. Decay is applied lazily through a shared
+scale factor, so a tick costs O(fleet * lookahead) regardless of grid size.
+
+    cmap = CongestionMap()
+    cmap.update(uavs)
+    path = compute_path(G, pos, s, t, weight=cmap.weight_fn(exclude=uav.id))
+
+A replanning UAV passes its own id so the demand it added this tick does not
+push it off the corridor it already holds.
+"""
+
+class CongestionMap:
+    def __init__(self, decay=0.8, lookahead=6, alpha=0.5):
+        self.decay = decay
+        self.lookahead = lookahead
+        self.alpha = alpha
+        self.node = {}      # node -> demand / scale
+        self.edge = {}      # (u, v) sorted -> demand / scale
+        self.own = {}       # uid -> (node, edge) demand it added in its latest add_path
+        self._scale = 1.0
+
+    def _key(self, u, v):
+        return (u, v) if u <= v else (v, u)
+
+    def _renormalize(self):
+        # Fold the scale back into the stored values and drop what has decayed away
+        s = self._scale
+        self.node = {n: d * s for n, d in self.node.items() if d * s > 1e-3}
+        self.edge = {e: d * s for e, d in self.edge.items() if d * s > 1e-3}
+        self.own = {uid: ({n: d * s for n, d in nodes.items()}, {e: d * s for e, d in edges.items()})
+                    for uid, (nodes, edges) in self.own.items()}
+        self._scale = 1.0
+
+    def step(self):
+        """Age all demand by one tick."""
+        self._scale *= self.decay
+        if self._scale < 1e-6:
+            self._renormalize()
+
+    def add_path(self, uav):
+        """Add one tick of demand for a UAV's held node and upcoming hops."""
+        inv = 1.0 / self._scale
+        own_node = {uav.cur_node: inv}
+        own_edge = {}
+        path = uav.path_nodes
+        start = uav.next_node_index
+        for k in range(start, min(start + self.lookahead, len(path) - 1)):
+            share = inv / (k - start + 2)
+            a, b = path[k], path[k + 1]
+            own_node[b] = own_node.get(b, 0.0) + share
+            key = self._key(a, b)
+            own_edge[key] = own_edge.get(key, 0.0) + share
+        for n, d in own_node.items():
+            self.node[n] = self.node.get(n, 0.0) + d
+        for e, d in own_edge.items():
+            self.edge[e] = self.edge.get(e, 0.0) + d
+        self.own[uav.id] = (own_node, own_edge)
+
+    def update(self, uavs):
+        """Per-tick update: age existing demand, then add the fleet's current demand."""
+        self.step()
+        self.own = {}
+        for u in uavs:
+            if not u.reached:
+                self.add_path(u)
+
+    def to_arrays(self):
+        """(nodes, node demand, edges, edge demand) arrays, e.g. for checkpoints."""
+        import numpy as np
+        s = self._scale
+        nodes = np.asarray(list(self.node.keys()), dtype=np.int32).reshape(-1, 2)
+        edges = np.asarray([u + v for u, v in self.edge.keys()], dtype=np.int32).reshape(-1, 4)
+        return (nodes, np.asarray(list(self.node.values()), dtype=np.float64) * s,
+                edges, np.asarray(list(self.edge.values()), dtype=np.float64) * s)
+
+    @classmethod
+    def from_arrays(cls, nodes, node_demand, edges, edge_demand, **kwargs):
+        cmap = cls(**kwargs)
+        cmap.node = {(int(r), int(c)): float(d) for (r, c), d in zip(nodes, node_demand)}
+        cmap.edge = {((int(a), int(b)), (int(c), int(d))): float(w)
+                     for (a, b, c, d), w in zip(edges, edge_demand)}
+        return cmap
+
+    def node_load(self, n):
+        return self.node.get(n, 0.0) * self._scale
+
+    def edge_load(self, u, v):
+        return self.edge.get(self._key(u, v), 0.0) * self._scale
+
+    def weight_fn(self, alpha=None, exclude=None):
+        """networkx weight function: base weight scaled up by downstream demand.
+
+        exclude is the planning UAV's id; the demand it added in its latest
+        add_path is left out. Costs never drop below the base weight, so the
+        Euclidean A* heuristic stays admissible.
+        """
+        alpha = self.alpha if alpha is None else alpha
+        node, edge, key = self.node, self.edge, self._key
+        scale = self._scale
+        own_node, own_edge = self.own.get(exclude, ({}, {}))
+
+        def weight(u, v, d):
+            k = key(u, v)
+            load = node.get(v, 0.0) - own_node.get(v, 0.0) + edge.get(k, 0.0) - own_edge.get(k, 0.0)
+            return d.get("weight", 1.0) * (1.0 + alpha * max(load, 0.0) * scale)
+        return weight
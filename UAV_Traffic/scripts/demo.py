@@ -1,52 +1,47 @@
 # demo.py
 import os
 import json
+import time
 import random
-import joblib
+import functools
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
+import networkx as nx
 
-from simulate_uav import build_grid_graph, UAV
+from simulate_uav import build_grid_graph, UAV, resolve_conflicts, add_nofly_zones
 from path_planning import compute_path
-from visualization_helper import export_graph, draw_graph_with_path
 from backend_connector import send_data_to_backend  # Import the sender
+from instrumentation import PROFILER
 
 # -------------------------------
 # Configuration
 # -------------------------------
 RESULTS_DIR = "results"
-os.makedirs(RESULTS_DIR, exist_ok=True)
 
 MODEL_PATH = os.path.join(RESULTS_DIR, "uav_xgb_ml.pkl")
 ENCODER_PATH = os.path.join(RESULTS_DIR, "label_encoder.pkl")
 
-# Load trained ML model and encoder
-model = None
-label_encoder = None
-try:
-    model = joblib.load(MODEL_PATH)
-    label_encoder = joblib.load(ENCODER_PATH)
-    print("✅ Loaded ML model and encoder successfully.")
-except Exception as e:
-    print(f"❌ Error loading model or encoder: {e}")
-    exit(1)
-
 # -------------------------------
 # Utility functions
 # -------------------------------
-def add_nofly_zones(G, percent=0.02):
-    """Randomly mark a percentage of nodes as no-fly zones."""
-    num_nodes = len(G.nodes)
-    nofly_count = max(1,int(num_nodes * percent))
-    nofly_nodes = random.sample(list(G.nodes()), nofly_count)
-    for n in nofly_nodes:
-        G.nodes[n]["nofly"] = True
-    return list(nofly_nodes)
+@functools.lru_cache(maxsize=None)
+def load_model(model_path=MODEL_PATH, encoder_path=ENCODER_PATH):
+    """Load the trained ML model and label encoder once per process.
+
+    Raises FileNotFoundError when train_ml_model.py has not been run yet.
+    """
+    for path in (model_path, encoder_path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found, run train_ml_model.py first")
+    import joblib
+    model = joblib.load(model_path)
+    label_encoder = joblib.load(encoder_path)
+    print("✅ Loaded ML model and encoder successfully.")
+    return model, label_encoder
 
 def predict_next_move(model, label_encoder, u, goal_node, nofly_nodes):
     """Predict next move using ML model, handle stuck behavior and fallback if bad."""
     try:
+        import pandas as pd
         columns = [
             'episode', 'start_x', 'start_y', 'goal_x', 'goal_y',
             'uav_x', 'uav_y', 'distance_to_goal', 'nofly_zones'
@@ -104,7 +99,19 @@ def apply_move(uav, move, G, pos):
 # -------------------------------
 # Main Simulation
 # -------------------------------
-def merged_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", seed=None, visualize=True):
+def merged_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", seed=None, visualize=True,
+                      profile=False, trace=False, record_path=None, feed=None, stream=None,
+                      backend=True, graph_format="json"):
+    try:
+        model, label_encoder = load_model()
+    except Exception as e:
+        print(f"❌ Error loading model or encoder: {e}")
+        raise SystemExit(1)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    if profile or trace:
+        PROFILER.enable(trace=trace)
+
     if seed is not None:
         random.seed(seed) #Use fixed seed if provided
     else:
@@ -113,6 +120,8 @@ def merged_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", se
     # Build environment graph
     G, pos = build_grid_graph(rows=30, cols=30)
     nofly_nodes = add_nofly_zones(G, percent=0.02)
+    if stream is not None:
+        stream.set_nofly(nofly_nodes)
     print(f"🟠 No-fly zones generated: {len(nofly_nodes)} nodes")
 
     # ✅ Create random but valid start/goal nodes
@@ -145,16 +154,21 @@ def merged_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", se
     
 
     if visualize:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        from visualization_helper import LiveRenderer
+        renderer = LiveRenderer(G, pos, record=record_path is not None)
 
     steps = int(sim_time / dt)
 
+    # No-fly cells are fixed for the run: plan on one shared view instead of copying G per UAV
+    G_safe = nx.restricted_view(G, nofly_nodes, [])
+
     #Tracking UAV movemnet history for inconsistent behaviour
     last_positions = {u.id: [] for u in uavs}
     stuck_counter = {u.id: 0 for u in uavs}  # count how many times stuck condition triggered
     priority_order = sorted([u.id for u in uavs], key=lambda x: (0 if x==0 else 1, x))
 
     for step in range(steps):
+        tick_start = time.perf_counter()
         cur_occupancy = {u.cur_node: u.id for u in uavs if not u.reached}
         desired = {}
         for u in uavs:
@@ -163,7 +177,9 @@ def merged_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", se
                 continue
 
             # prev_node = u.cur_node
-            move = predict_next_move(model, label_encoder, u, u.goal_node, nofly_nodes)
+            candidate = None
+            with PROFILER.timer("tick.predict"):
+                move = predict_next_move(model, label_encoder, u, u.goal_node, nofly_nodes)
 
             # Try ML move
             if move:
@@ -174,13 +190,12 @@ def merged_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", se
                     candidate = None
             if candidate is None:
                 # ML failed — fallback to path planning
-                G_safe = u.G.copy()
-                G_safe.remove_nodes_from([n for n in nofly_nodes if n in G_safe])
-                try:
-                    new_path = compute_path(G_safe, pos, u.cur_node, u.goal_node, algo=planner_algo)
+                with PROFILER.timer("tick.fallback_plan"):
+                    try:
+                        new_path = compute_path(G_safe, pos, u.cur_node, u.goal_node, algo=planner_algo)
 
-                except Exception:
-                    new_path = None
+                    except Exception:
+                        new_path = None
                 if new_path and len(new_path) > 1:
                     candidate = new_path[1]
                 else:
@@ -191,72 +206,10 @@ def merged_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", se
                 candidate = None
 
         # 2) Resolve conflicts by priority
-        # Build node -> list(uav_id) mapping for desired targets
-        targets = {}
-        for uid, node in desired.items():
-            if node is None:
-                continue
-            targets.setdefault(node, []).append(uid)
-
-        # Winners set (uids allowed to move), losers will wait
-        allowed_to_move = set()
-
-        # Handle conflicts for nodes targeted by >1 UAV
-        for node, uids in targets.items():
-            if len(uids) == 1:
-                # single claimant -> allowed (but check further below for occupancy swap)
-                allowed_to_move.add(uids[0])
-            else:
-                # choose winner by priority_order (lowest index first)
-                # priority_order is list of UAV ids sorted by priority
-                for p in priority_order:
-                    if p in uids:
-                        allowed_to_move.add(p)
-                        break
-                # others are denied (they will wait)
-
-        # Prevent swaps: if A wants B.cur_node and B wants A.cur_node -> allow higher priority only
-        for u in uavs:
-            uid = u.id
-            cand = desired.get(uid)
-            if cand is None:
-                continue
-            # If cand currently occupied by someone
-            occ = cur_occupancy.get(cand)
-            if occ is not None and occ != uid:
-                # if occ wants to move into uid.cur_node (swap)
-                occ_desired = desired.get(occ)
-                if occ_desired == u.cur_node:
-                    # decide by priority
-                    # if uid has higher priority than occ -> keep uid allowed, deny occ
-                    if priority_order.index(uid) <= priority_order.index(occ):
-                        allowed_to_move.add(uid)
-                        if occ in allowed_to_move:
-                            allowed_to_move.remove(occ)
-                    else:
-                        # occ has higher priority -> ensure occ allowed
-                        allowed_to_move.add(occ)
-                        if uid in allowed_to_move:
-                            allowed_to_move.remove(uid)
-
-        # Also ensure nobody moves into a node that will be occupied by a higher-priority UAV that is not moving away
-        # Build set of nodes that will remain occupied by higher priority UAVs
-        staying_nodes = set()
-        for u in uavs:
-            # if this UAV is not allowed to move or had no desired -> it will stay
-            if u.id not in allowed_to_move:
-                staying_nodes.add(u.cur_node)
-
-        # Remove from allowed_to_move any UAV that would move into a staying node occupied by higher priority
-        for uid in list(allowed_to_move):
-            target = desired.get(uid)
-            if target in staying_nodes:
-                # find occupying UAV id
-                occupant = cur_occupancy.get(target)
-                if occupant is not None:
-                    # if occupant has higher priority than uid -> deny uid
-                    if priority_order.index(occupant) <= priority_order.index(uid):
-                        allowed_to_move.discard(uid)
+        with PROFILER.timer("tick.resolve"):
+            allowed_to_move = resolve_conflicts(uavs, desired, cur_occupancy, priority_order)
+        PROFILER.count("tick.waits", sum(1 for uid, n in desired.items()
+                                         if n is not None and uid not in allowed_to_move))
 
         # 3) Apply allowed moves
         new_occupancy = dict(cur_occupancy)  # copy
@@ -276,65 +229,71 @@ def merged_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", se
                 pass
 
         # 4) Update trackers for oscillation/stuck detection
-        for u in uavs:
-            last_positions[u.id].append(u.cur_node)
-            if len(last_positions[u.id]) > 8:
-                last_positions[u.id].pop(0)
-
-            # detect stuck (same pos many times or oscillation between two nodes)
-            if len(last_positions[u.id]) >= 6:
-                unique = len(set(last_positions[u.id]))
-                if unique == 1:
-                    stuck_counter[u.id] += 1
-                elif unique == 2 and last_positions[u.id][-1] == last_positions[u.id][-3]:
-                    stuck_counter[u.id] += 1
-                else:
-                    stuck_counter[u.id] = 0
-
-                if stuck_counter[u.id] >= 3:
-                    # recompute path on nofly-safe graph and force first hop
-                    G_safe = u.G.copy()
-                    G_safe.remove_nodes_from([n for n in nofly_nodes if n in G_safe])
-                    new_path = compute_path(G_safe, pos, u.cur_node, u.goal_node, algo=planner_algo)
-                    if new_path and len(new_path) > 1:
-                        print(f"⚠️ UAV{u.id} stuck for too long. Recomputing path...")
-                        u.cur_node = new_path[1]
-                        u.pos = np.array(pos[new_path[1]])
-                        # reset history/counter
-                        last_positions[u.id] = [u.cur_node]
+        with PROFILER.timer("tick.stuck"):
+            for u in uavs:
+                last_positions[u.id].append(u.cur_node)
+                if len(last_positions[u.id]) > 8:
+                    last_positions[u.id].pop(0)
+
+                # detect stuck (same pos many times or oscillation between two nodes)
+                if len(last_positions[u.id]) >= 6:
+                    unique = len(set(last_positions[u.id]))
+                    if unique == 1:
+                        stuck_counter[u.id] += 1
+                    elif unique == 2 and last_positions[u.id][-1] == last_positions[u.id][-3]:
+                        stuck_counter[u.id] += 1
+                    else:
                         stuck_counter[u.id] = 0
 
-            if u.cur_node == u.goal_node:
-                u.reached = True
+                    if stuck_counter[u.id] >= 3:
+                        # recompute path on nofly-safe graph and force first hop
+                        new_path = compute_path(G_safe, pos, u.cur_node, u.goal_node, algo=planner_algo)
+                        if new_path and len(new_path) > 1:
+                            print(f"⚠️ UAV{u.id} stuck for too long. Recomputing path...")
+                            PROFILER.count("tick.stuck_replans")
+                            u.cur_node = new_path[1]
+                            u.pos = np.array(pos[new_path[1]])
+                            # reset history/counter
+                            last_positions[u.id] = [u.cur_node]
+                            stuck_counter[u.id] = 0
+
+                if u.cur_node == u.goal_node:
+                    u.reached = True
 
         sim_snapshots = []
-        snapshot = [
-            {
-                "id": int(u.id),
-                "x": float(u.pos[0]),
-                "y": float(u.pos[1]),
-                "start": list(u.start_node),
-                "goal": list(u.goal_node),
-                "reached": bool(u.reached),
-                "path": [list(n) for n in u.path_nodes],
-            } for u in uavs
-        ]
-        sim_snapshots.append(snapshot)
+        with PROFILER.timer("tick.snapshot"):
+            snapshot = [
+                {
+                    "id": int(u.id),
+                    "x": float(u.pos[0]),
+                    "y": float(u.pos[1]),
+                    "start": list(u.start_node),
+                    "goal": list(u.goal_node),
+                    "reached": bool(u.reached),
+                    "path": [list(n) for n in u.path_nodes],
+                } for u in uavs
+            ]
+            sim_snapshots.append(snapshot)
+
+        if feed is not None:
+            with PROFILER.timer("tick.feed"):
+                feed.publish(step, uavs, t=(step + 1) * dt)
+
+        if stream is not None:
+            with PROFILER.timer("tick.stream"):
+                stream.publish(step, uavs, t=(step + 1) * dt)
 
         #Send each step to backend
-        send_data_to_backend(uavs, step, nofly_nodes)
+        if backend:
+            with PROFILER.timer("tick.backend"):
+                send_data_to_backend(uavs, step, nofly_nodes)
 
         # Visualization
         if visualize:
-            ax.clear()
-            draw_graph_with_path(G, pos, path=None, start=None, goal=None, nofly_nodes=nofly_nodes, ax=ax)
-            xs = [u.pos[0] for u in uavs]
-            ys = [u.pos[1] for u in uavs]
-            ax.scatter(xs, ys, s=100, color="blue", zorder=6)
-            for u in uavs:
-                ax.text(u.pos[0], u.pos[1] + 0.08, f"U{u.id}", fontsize=8, zorder=7)
-            ax.set_title(f"Step {step} / {steps}")
-            plt.pause(0.05)
+            with PROFILER.timer("tick.render"):
+                renderer.update(uavs, nofly_nodes, title=f"Step {step} / {steps}")
+
+        PROFILER.record("tick", tick_start, time.perf_counter())
 
         # stop if all reached
         if all(u.reached for u in uavs):
@@ -346,10 +305,23 @@ def merged_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", se
         json.dump(sim_snapshots, f, indent=2)
     print(f"Saved simulation output")
 
-    export_graph(G, pos, filepath=os.path.join(RESULTS_DIR, "graph.json"))
+    from visualization_helper import export_graph
+    # graph.json by default; the compact binary format (airspace_io) is opt-in
+    graph_file = "graph.uava" if graph_format == "binary" else "graph.json"
+    export_graph(G, pos, filepath=os.path.join(RESULTS_DIR, graph_file), fmt=graph_format)
     print(f"Saved graph output")
+
+    if PROFILER.enabled:
+        print(PROFILER.format_summary())
+        PROFILER.write_summary(os.path.join(RESULTS_DIR, "profile_summary.json"))
+        if PROFILER.trace:
+            PROFILER.write_trace(os.path.join(RESULTS_DIR, "profile_trace.json"))
+        print(f"Saved profile output")
+        PROFILER.disable()
     if visualize:
-        plt.close(fig)
+        if record_path is not None:
+            renderer.save_video(record_path)
+        renderer.close()
 
 
 # -------------------------------
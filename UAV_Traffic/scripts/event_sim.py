@@ -0,0 +1,289 @@
+# scripts/event_sim.py
+"""Discrete-event variant of run_simulation.
+
+Instead of re-evaluating every UAV each dt, the engine keeps a priority
+queue of the next thing that can happen:
+
+    ARRIVE  a UAV reaches the node at the end of its current edge
+    TRY     a UAV at a node attempts to depart (after arriving or being woken)
+    REPLAN  a UAV has waited replan_after seconds on a reserved node
+    ZONE    no-fly cells are added or removed
+
+A UAV blocked by a reservation parks on that node's waiter list and is only
+woken when the node is released, so idle and waiting UAVs cost nothing
+between events. State is still sampled every sample_dt to produce a
+snapshot list in the same format as run_simulation.
+
+This is not a drop-in replacement for tick mode. Motion and conflict
+handling differ (continuous-time arrivals, waiter wake-ups, timed replans
+instead of per-tick priority resolution), so snapshot counts and wait
+totals do not match a tick run of the same scenario. It only pays off for
+large fleets: about 6.7x faster per sampled tick at 60 UAVs, about 2x at
+20, and no faster, or slower, for a handful of UAVs.
+"""
+import heapq
+import random
+import numpy as np
+import networkx as nx
+
+from simulate_uav import build_grid_graph, fleet_stats, _random_fleet
+from path_planning import compute_path
+from instrumentation import PROFILER
+
+ARRIVE, TRY, REPLAN, ZONE = range(4)
+
+
+class EventEngine:
+    def __init__(self, G, pos, uavs, planner_algo="astar", replan_after=0.75, zone_changes=None):
+        self.G = G
+        self.pos = pos
+        self.uavs = {u.id: u for u in uavs}
+        self.planner_algo = planner_algo
+        self.replan_after = replan_after
+        self.nofly = set()
+
+        self.now = 0.0
+        self.queue = []
+        self._seq = 0
+        self.events_processed = 0
+
+        self.occupant = {}      # node -> uid holding it (current node or inbound claim)
+        self.waiters = {}       # node -> set of uids waiting for it to be released
+        self.waiting_on = {}    # uid -> node
+        self.wait_epoch = {}    # uid -> bumped on every departure, invalidates stale REPLANs
+        self.transit = {}       # uid -> (depart time, arrival time, from pos, to pos)
+
+        for u in uavs:
+            self.wait_epoch[u.id] = 0
+            if not u.reached:
+                self.occupant[u.cur_node] = u.id
+                self.push(0.0, TRY, u.id)
+        for change in zone_changes or ():
+            self.push(change["time"], ZONE, change)
+
+    # -------------------------------
+    # Queue helpers
+    # -------------------------------
+    def push(self, t, kind, payload, epoch=None):
+        self._seq += 1
+        heapq.heappush(self.queue, (t, self._seq, kind, payload, epoch))
+
+    def next_time(self):
+        return self.queue[0][0] if self.queue else None
+
+    def _release(self, node, uid):
+        if self.occupant.get(node) == uid:
+            del self.occupant[node]
+            self._wake_waiters(node)
+
+    def _wake_waiters(self, node):
+        for w in self.waiters.pop(node, ()):
+            if self.waiting_on.get(w) == node:
+                self.push(self.now, TRY, w)
+
+    def _clear_wait(self, uid):
+        """Stop waiting outside of a departure; ends the UAV's pending REPLAN chain too."""
+        old = self.waiting_on.pop(uid, None)
+        if old is None:
+            return False
+        self.waiters.get(old, set()).discard(uid)
+        self.wait_epoch[uid] += 1
+        return True
+
+    def _blocked_by_other(self, node, uid):
+        holder = self.occupant.get(node)
+        return holder is not None and holder != uid
+
+    # -------------------------------
+    # Event handlers
+    # -------------------------------
+    def step(self):
+        """Process the earliest event. Returns False once the queue is empty."""
+        if not self.queue:
+            return False
+        t, _, kind, payload, epoch = heapq.heappop(self.queue)
+        self.now = t
+        self.events_processed += 1
+        if kind == ARRIVE:
+            self._arrive(payload)
+        elif kind == TRY:
+            self._try_move(payload)
+        elif kind == REPLAN:
+            self._replan(payload, epoch)
+        elif kind == ZONE:
+            self._zone_change(payload)
+        return True
+
+    def _try_move(self, uid):
+        u = self.uavs[uid]
+        if u.reached or uid in self.transit:
+            return
+        nxt = u.next_node()
+        if nxt is None:
+            u.reached = True
+            self._release(u.cur_node, uid)
+            return
+
+        if self._blocked_by_other(nxt, uid) or nxt in self.nofly:
+            if uid not in self.waiting_on:
+                self.push(self.now + self.replan_after, REPLAN, uid, self.wait_epoch[uid])
+            self.waiting_on[uid] = nxt
+            self.waiters.setdefault(nxt, set()).add(uid)
+            u.wait_count += 1
+            u.total_wait += 1
+            return
+
+        # Depart: claim the next node, keep holding the current one until arrival
+        self.waiting_on.pop(uid, None)
+        self.wait_epoch[uid] += 1
+        self.occupant[nxt] = uid
+        src = np.array(u.pos, dtype=float)
+        dst = np.array(self.pos[nxt], dtype=float)
+        duration = float(np.linalg.norm(dst - src)) / u.speed
+        self.transit[uid] = (self.now, self.now + duration, src, dst)
+        self.push(self.now + duration, ARRIVE, uid)
+
+    def _arrive(self, uid):
+        u = self.uavs[uid]
+        _, _, _, dst = self.transit.pop(uid)
+        prev = u.cur_node
+        u.pos = dst.copy()
+        u.cur_node = u.path_nodes[u.next_node_index + 1]
+        u.next_node_index += 1
+        u.trajectory.append(tuple(u.pos))
+        u.wait_count = 0
+        self._release(prev, uid)
+        if u.cur_node == u.goal_node:
+            u.reached = True
+            self._release(u.cur_node, uid)
+            return
+        self._try_move(uid)
+
+    def _replan(self, uid, epoch):
+        u = self.uavs[uid]
+        if u.reached or epoch != self.wait_epoch[uid] or uid not in self.waiting_on:
+            return
+        blocked = {n for n, holder in self.occupant.items() if holder != uid} | self.nofly
+        blocked.discard(u.cur_node)
+        blocked.discard(u.goal_node)
+        view = nx.restricted_view(self.G, blocked, [])
+
+        for algo in [self.planner_algo, 'dijkstra', 'bfs']:
+            path = compute_path(view, self.pos, u.cur_node, u.goal_node, algo=algo)
+            if path:
+                self._clear_wait(uid)
+                u.path_nodes = path
+                u.next_node_index = 0
+                u.wait_count = 0
+                PROFILER.count("event.replans")
+                self._try_move(uid)
+                return
+        # Nothing better right now; look again later
+        self.push(self.now + self.replan_after, REPLAN, uid, epoch)
+
+    def _zone_change(self, change):
+        added = set(change.get("add", ())) - self.nofly
+        removed = set(change.get("remove", ())) & self.nofly
+        self.nofly |= added
+        self.nofly -= removed
+        # UAVs parked in front of a reopened cell can try it right away
+        for node in removed:
+            self._wake_waiters(node)
+        if not added:
+            return
+        # Only UAVs whose remaining route crosses a new no-fly cell are affected
+        view = nx.restricted_view(self.G, self.nofly, [])
+        for u in self.uavs.values():
+            if u.reached:
+                continue
+            remaining = u.path_nodes[u.next_node_index + 1:]
+            if not added.intersection(remaining):
+                continue
+            start = u.path_nodes[u.next_node_index + 1] if u.id in self.transit else u.cur_node
+            path = compute_path(view, self.pos, start, u.goal_node, algo=self.planner_algo)
+            if not path:
+                continue
+            if u.id in self.transit:
+                u.path_nodes = [u.cur_node] + path
+            else:
+                u.path_nodes = path
+            u.next_node_index = 0
+            if self._clear_wait(u.id):
+                self.push(self.now, TRY, u.id)
+
+    # -------------------------------
+    # Sampling
+    # -------------------------------
+    def position(self, u, t):
+        leg = self.transit.get(u.id)
+        if leg is None:
+            return u.pos
+        t0, t1, src, dst = leg
+        frac = 1.0 if t1 <= t0 else min(1.0, max(0.0, (t - t0) / (t1 - t0)))
+        return src + (dst - src) * frac
+
+    def snapshot(self, t):
+        out = []
+        for u in self.uavs.values():
+            p = self.position(u, t)
+            out.append({
+                "_id": f"UAV{u.id}",
+                "status": "flying" if not u.reached else "idle",
+                "latitude": float(p[0]),
+                "longitude": float(p[1]),
+                "altitude": float(u.altitude)
+            })
+        return out
+
+    def run(self, sim_time, sample_dt, feed=None):
+        """Advance to sim_time, sampling a snapshot every sample_dt."""
+        snapshots = []
+        step = 0
+        next_sample = sample_dt
+        while next_sample <= sim_time + 1e-9:
+            nt = self.next_time()
+            while nt is not None and nt <= next_sample:
+                self.step()
+                nt = self.next_time()
+            snapshots.append(self.snapshot(next_sample))
+            if feed is not None:
+                uavs = list(self.uavs.values())
+                feed.publish(step, uavs, t=next_sample,
+                             positions=[self.position(u, next_sample) for u in uavs])
+            step += 1
+            if all(u.reached for u in self.uavs.values()):
+                break
+            if nt is None:
+                # Nothing else will ever happen; the remaining samples would be identical
+                break
+            next_sample += sample_dt
+        return snapshots
+
+
+# -------------------------------
+# Simulation helper
+# -------------------------------
+def run_event_simulation(num_uavs=7, sim_time=60, sample_dt=0.25, planner_algo="astar", seed=None,
+                         rows=30, cols=30, replan_after=0.75, zone_changes=None, feed=None,
+                         stats=None):
+    """Event-driven counterpart of run_simulation with the same scenario setup.
+
+    zone_changes is an optional list of {"time": t, "add": [...], "remove": [...]}
+    no-fly updates. stats, if given, is filled with fleet_stats() over the
+    sampled time; its wait_ticks counts blocked departure attempts.
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    G, pos = build_grid_graph(rows=rows, cols=cols)
+    uavs = _random_fleet(G, pos, num_uavs)
+    for u in uavs:
+        u.compute_path(algo=planner_algo)
+
+    engine = EventEngine(G, pos, uavs, planner_algo=planner_algo, replan_after=replan_after,
+                         zone_changes=zone_changes)
+    with PROFILER.timer("event.run"):
+        snapshots = engine.run(sim_time, sample_dt, feed=feed)
+    if stats is not None:
+        stats.update(fleet_stats(uavs, len(snapshots), sample_dt))
+    return snapshots
@@ -2,18 +2,13 @@ import os
 import json
 import random
 import argparse
-import pandas as pd
-from tqdm import tqdm
 from pathlib import Path
 
-from simulate_uav import build_grid_graph, UAV
-from path_planning import compute_path
-from demo import add_nofly_zones
+from airspace_template import AirspaceTemplate
 
 MAX_NEIGHBORS = 4
 
 RESULTS_DIR = "results"
-os.makedirs(RESULTS_DIR, exist_ok=True)
 
 def parse_node(node):
     _, coords = node.split("N")[-1], node #safety
@@ -25,7 +20,75 @@ def generate_random_coordinates(rows, cols):
     c = random.randint(0, cols - 1)
     return (r,c)
 
+def label_episode(episode, no_fly_zones, ep, args):
+    """Sample start/goal pairs on one episode's airspace and label every path step.
+
+    Paths are planned through the EpisodeOverlay, so its no-fly cells and any
+    edge weight overrides apply.
+    """
+    rows = []
+    for _ in range(args.num_uavs):
+        start = generate_random_coordinates(args.rows, args.cols)
+        goal = generate_random_coordinates(args.rows, args.cols)
+
+        # Avoid same start and goal
+        if start == goal:
+            continue
+
+        try:
+            path = episode.compute_path(start, goal, algo=args.label_algo)
+
+            if not path or len(path) < 2:
+                continue
+
+            # Record step-by-step data
+            for i in range(len(path) - 1):
+                current = path[i]
+                next_step = path[i + 1]
+
+                curr_x , curr_y = current
+                next_x, next_y = next_step
+                goal_x, goal_y = goal
+                start_x, start_y = start
+
+                dx = next_x - curr_x
+                dy = next_y - curr_y
+
+                # Encode move direction
+                if dx == 1 and dy == 0:
+                    move = "DOWN"
+                elif dx == -1 and dy == 0:
+                    move = "UP"
+                elif dx == 0 and dy == 1:
+                    move = "RIGHT"
+                elif dx == 0 and dy == -1:
+                    move = "LEFT"
+                else:
+                    move = "STAY"
+
+                # print(f"Episode {ep}, UAV start={start}, goal={goal}, path_len={len(path)}")
+
+                rows.append({
+                    "episode": ep,
+                    "start_x": start_x,
+                    "start_y": start_y,
+                    "goal_x": goal_x,
+                    "goal_y": goal_y,
+                    "uav_x": curr_x,
+                    "uav_y": curr_y,
+                    "distance_to_goal": ((goal_x - curr_x) ** 2 + (goal_y - curr_y) ** 2) ** 0.5,
+                    "nofly_zones": list(no_fly_zones),
+                    "next_move": move
+                })
+
+        except Exception as e:
+            print(f"Failed for start={start}, goal={goal}: {e}")
+
+    return rows
+
 def generate_dataset(args):
+    import pandas as pd
+    from tqdm import tqdm
 
     random.seed(args.seed)
     results_dir = Path("results")
@@ -36,67 +99,14 @@ def generate_dataset(args):
     print(f"\n🚀 Generating dataset with {args.episodes} episodes × {args.num_uavs} UAVs per episode")
     print(f"Grid: {args.rows}x{args.cols}, Label Algo: {args.label_algo}\n")
 
-    for ep in tqdm(range(args.episodes), desc="Generating Episodes"):
-        # Build grid and apply no-fly zones
-        graph, pos = build_grid_graph(args.rows, args.cols)
-        no_fly_zones = add_nofly_zones(graph, percent=args.nofly_percent)
-
-        for _ in range(args.num_uavs):
-            start = generate_random_coordinates(args.rows, args.cols)
-            goal = generate_random_coordinates(args.rows, args.cols)
+    # The grid is built once; each episode only overlays its no-fly cells
+    template = AirspaceTemplate.for_grid(args.rows, args.cols)
 
-            # Avoid same start and goal
-            if start == goal:
-                continue
+    for ep in tqdm(range(args.episodes), desc="Generating Episodes"):
+        episode = template.episode()
+        no_fly_zones = episode.add_random_nofly(args.nofly_percent)
 
-            try:
-                path = compute_path(graph, pos, start, goal, algo=args.label_algo)
-
-                if not path or len(path) < 2:
-                    continue
-
-                # Record step-by-step data
-                for i in range(len(path) - 1):
-                    current = path[i]
-                    next_step = path[i + 1]
-
-                    curr_x , curr_y = current
-                    next_x, next_y = next_step
-                    goal_x, goal_y = goal
-                    start_x, start_y = start
-
-                    dx = next_x - curr_x
-                    dy = next_y - curr_y
-
-                    # Encode move direction
-                    if dx == 1 and dy == 0:
-                        move = "DOWN"
-                    elif dx == -1 and dy == 0:
-                        move = "UP"
-                    elif dx == 0 and dy == 1:
-                        move = "RIGHT"
-                    elif dx == 0 and dy == -1:
-                        move = "LEFT"
-                    else:
-                        move = "STAY"
-
-                    # print(f"Episode {ep}, UAV start={start}, goal={goal}, path_len={len(path)}")
-
-                    data.append({
-                        "episode": ep,
-                        "start_x": start_x,
-                        "start_y": start_y,
-                        "goal_x": goal_x,
-                        "goal_y": goal_y,
-                        "uav_x": curr_x,
-                        "uav_y": curr_y,
-                        "distance_to_goal": ((goal_x - curr_x) ** 2 + (goal_y - curr_y) ** 2) ** 0.5,
-                        "nofly_zones": list(no_fly_zones),
-                        "next_move": move
-                    })
-
-            except Exception as e:
-                print(f"Failed for start={start}, goal={goal}: {e}")
+        data.extend(label_episode(episode, no_fly_zones, ep, args))
 
     if not data:
         print("Warning : No data generated")
@@ -127,7 +137,7 @@ def generate_dataset(args):
 
 
 
-if __name__ == "__main__":
+def build_parser():
     parser = argparse.ArgumentParser()
     parser.add_argument("--episodes", type=int, default=500)
     parser.add_argument("--steps", type=int, default=20)
@@ -141,5 +151,11 @@ if __name__ == "__main__":
     parser.add_argument("--train_fraction", type=float, default=0.8)
     parser.add_argument("--seed", type=int, default=42)
     parser.add_argument("--nofly_percent", type=float, default=0.06)
-    args = parser.parse_args()
-    generate_dataset(args)
+    return parser
+
+def main(argv=None):
+    generate_dataset(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
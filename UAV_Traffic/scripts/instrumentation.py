@@ -0,0 +1,143 @@
+# scripts/instrumentation.py
+"""Named timers and counters for the simulation loop.
+
+Disabled by default; a disabled profiler hands back a shared no-op context
+so instrumented code pays one attribute check per timer.
+
+    from instrumentation import PROFILER
+    PROFILER.enable(trace=True)
+    with PROFILER.timer("tick.predict"):
+        ...
+    PROFILER.count("tick.fallback")
+    PROFILER.write_summary("results/profile_summary.json")
+    PROFILER.write_trace("results/profile_trace.json")   # chrome://tracing / Perfetto
+"""
+import os
+import json
+import time
+import threading
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+def _percentile(ordered, q):
+    k = max(0, min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+class Profiler:
+    def __init__(self, enabled=False, trace=False):
+        self.enabled = enabled
+        self.trace = trace
+        self.reset()
+
+    def reset(self):
+        self.samples = {}     # name -> list of durations in seconds
+        self.counters = {}    # name -> int
+        self.events = []      # (name, start, end, thread id) when tracing
+        self.origin = time.perf_counter()
+
+    def enable(self, trace=False):
+        self.reset()
+        self.enabled = True
+        self.trace = trace
+
+    def disable(self):
+        self.enabled = False
+
+    def timer(self, name):
+        """Context manager timing the enclosed block under name."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def record(self, name, start, end):
+        if not self.enabled:
+            return
+        self.samples.setdefault(name, []).append(end - start)
+        if self.trace:
+            self.events.append((name, start, end, threading.get_ident()))
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        """Per-timer count/total/mean/p50/p99 (milliseconds) plus counters."""
+        timers = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            total = sum(ordered)
+            timers[name] = {
+                "count": len(ordered),
+                "total_ms": total * 1000.0,
+                "mean_ms": total / len(ordered) * 1000.0,
+                "p50_ms": _percentile(ordered, 50) * 1000.0,
+                "p99_ms": _percentile(ordered, 99) * 1000.0,
+                "max_ms": ordered[-1] * 1000.0,
+            }
+        return {"timers": timers, "counters": dict(self.counters)}
+
+    def format_summary(self):
+        s = self.summary()
+        lines = [f"{'phase':<28}{'count':>8}{'total ms':>12}{'p50 ms':>10}{'p99 ms':>10}"]
+        for name, t in sorted(s["timers"].items(), key=lambda kv: -kv[1]["total_ms"]):
+            lines.append(f"{name:<28}{t['count']:>8}{t['total_ms']:>12.2f}"
+                         f"{t['p50_ms']:>10.3f}{t['p99_ms']:>10.3f}")
+        for name, n in sorted(s["counters"].items()):
+            lines.append(f"{name:<28}{n:>8}")
+        return "\n".join(lines)
+
+    def write_summary(self, filepath):
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        with open(filepath, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_trace(self, filepath):
+        """Write recorded spans in Chrome trace-event format."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, end, tid in self.events
+        ]
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        with open(filepath, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+# Process-wide profiler shared by the simulation modules
+PROFILER = Profiler()
@@ -1,6 +1,7 @@
 # scripts/path_planning.py
 import math
 import networkx as nx
+from instrumentation import PROFILER
 
 def euclid_pos(u, v, pos):
     """Euclidean distance between node u and v given pos dict."""
@@ -55,13 +56,19 @@ def astar_path(G, pos, source, target, weight='weight'):
         return None
 
 # small helper to pick by name
-def compute_path(G, pos, source, target, algo='astar'):
+# weight is an edge attribute name or a networkx weight function (u, v, d) -> cost;
+# bfs ignores it
+def compute_path(G, pos, source, target, algo='astar', weight='weight'):
+    with PROFILER.timer("compute_path"):
+        return _compute_path(G, pos, source, target, algo, weight)
+
+def _compute_path(G, pos, source, target, algo, weight):
     algo = (algo or 'astar').lower()
     if algo == 'astar':
-        return astar_path(G, pos, source, target)
+        return astar_path(G, pos, source, target, weight=weight)
     if algo == 'dijkstra':
-        return dijkstra_path(G, source, target)
+        return dijkstra_path(G, source, target, weight=weight)
     if algo == 'bfs':
         return bfs_path(G, source, target)
     # fallback to dijkstra if unknown
-    return dijkstra_path(G, source, target)
+    return dijkstra_path(G, source, target, weight=weight)
@@ -0,0 +1,289 @@
+# scripts/shm_feed.py
+"""Shared-memory ring buffer carrying fleet state for co-located consumers.
+
+The simulation publishes one fixed-layout record per UAV every tick into a
+ring of `capacity` slots. Readers in other processes attach by name and get
+numpy views straight into the shared buffer, with no copying or parsing.
+
+Each slot is guarded by a sequence number (seqlock): the writer sets it odd
+while writing tick n and to 2*n once the slot is complete. A reader checks
+it before and after looking at the data, so a torn or overwritten slot is
+detected instead of locking. The writer never waits. A reader that falls
+more than `capacity` ticks behind skips ahead and counts the dropped ticks.
+A fleet larger than `max_uavs` is rejected rather than truncated, and a
+segment that already exists is only taken over with replace=True.
+
+    # simulation side
+    feed = FleetFeedWriter("uav_fleet")
+    run_simulation(feed=feed)
+    feed.close()
+
+    # consumer side
+    reader = FleetFeedReader("uav_fleet")
+    for tick in reader.follow():
+        print(tick.step, tick.records["x"].mean())
+"""
+import sys
+import time
+import struct
+import argparse
+import numpy as np
+from multiprocessing import shared_memory
+
+MAGIC = b"UAVF"
+VERSION = 2
+
+STATUS_FLYING = 0
+STATUS_REACHED = 1
+
+# Per-UAV record, identical layout for writer and readers
+RECORD_DTYPE = np.dtype([
+    ("id", "<i4"),
+    ("status", "u1"),
+    ("_pad", "u1", (3,)),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("cur_r", "<i4"),
+    ("cur_c", "<i4"),
+    ("goal_r", "<i4"),
+    ("goal_c", "<i4"),
+    ("alt", "<f4"),
+])
+
+# magic, version, capacity, max_uavs, slot size, head sequence
+_HEADER = struct.Struct("<4sIIIIxxxxQ")
+_HEADER_SIZE = 64
+_HEAD_OFFSET = 24
+# seq, step, sim time, record count
+_SLOT_HEADER = np.dtype([("seq", "<u8"), ("step", "<u8"), ("t", "<f8"), ("count", "<u4"), ("_pad", "<u4")])
+
+
+def _slot_size(max_uavs):
+    return _SLOT_HEADER.itemsize + RECORD_DTYPE.itemsize * max_uavs
+
+
+class _FeedBuffer:
+    """Typed views over the shared segment (header, slot headers, records)."""
+
+    def __init__(self, shm, capacity, max_uavs, readonly=False):
+        self.shm = shm
+        self.capacity = capacity
+        self.max_uavs = max_uavs
+        buf = shm.buf
+        self.head = np.ndarray((1,), "<u8", buf, _HEAD_OFFSET)
+        slot_size = _slot_size(max_uavs)
+        self.slots = []
+        for k in range(capacity):
+            base = _HEADER_SIZE + k * slot_size
+            header = np.ndarray((), _SLOT_HEADER, buf, base)
+            records = np.ndarray((max_uavs,), RECORD_DTYPE, buf, base + _SLOT_HEADER.itemsize)
+            if readonly:
+                records.flags.writeable = False
+            self.slots.append((header, records))
+
+    def release(self):
+        # Drop the views before closing, otherwise the mmap cannot be released
+        self.head = None
+        self.slots = []
+
+
+_CREATED = set()  # segment names this process created and has not unlinked yet
+
+
+class FleetFeedWriter:
+    def __init__(self, name="uav_fleet", capacity=256, max_uavs=256, replace=False):
+        size = _HEADER_SIZE + capacity * _slot_size(max_uavs)
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            if not replace:
+                raise FileExistsError(f"Shared memory {name!r} already exists (another simulation "
+                                      "may be publishing to it); pass replace=True to take it over")
+            # Left behind by a crashed run; take it over
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _CREATED.add(name)
+        self.name = name
+        self.shm.buf[:_HEADER.size] = _HEADER.pack(MAGIC, VERSION, capacity, max_uavs,
+                                                  _slot_size(max_uavs), 0)
+        self.buffer = _FeedBuffer(self.shm, capacity, max_uavs)
+        self.seq = 0
+
+    def publish(self, step, uavs, t=0.0, positions=None):
+        """Write one tick. positions overrides u.pos (e.g. interpolated positions)."""
+        n = len(uavs)
+        if n > self.buffer.max_uavs:
+            raise ValueError(f"Fleet of {n} UAVs does not fit a feed sized for {self.buffer.max_uavs}; "
+                             "create the writer with a larger max_uavs")
+        self.seq += 1
+        header, records = self.buffer.slots[(self.seq - 1) % self.buffer.capacity]
+
+        header["seq"] = 2 * self.seq - 1
+        rec = records[:n]
+        rec["id"] = [u.id for u in uavs[:n]]
+        rec["status"] = [STATUS_REACHED if u.reached else STATUS_FLYING for u in uavs[:n]]
+        xy = np.asarray([p[:2] for p in positions[:n]] if positions is not None
+                        else [u.pos[:2] for u in uavs[:n]], dtype=float).reshape(n, 2)
+        rec["x"] = xy[:, 0]
+        rec["y"] = xy[:, 1]
+        rec["alt"] = [u.altitude for u in uavs[:n]]
+        # Layered nodes are (i, j, layer); the band is carried by alt
+        cur = np.asarray([u.cur_node[:2] for u in uavs[:n]]).reshape(n, 2)
+        goal = np.asarray([u.goal_node[:2] for u in uavs[:n]]).reshape(n, 2)
+        rec["cur_r"], rec["cur_c"] = cur[:, 0], cur[:, 1]
+        rec["goal_r"], rec["goal_c"] = goal[:, 0], goal[:, 1]
+        header["step"] = step
+        header["t"] = t
+        header["count"] = n
+        header["seq"] = 2 * self.seq
+        self.buffer.head[0] = self.seq
+
+    def close(self, unlink=True):
+        self.buffer.release()
+        self.shm.close()
+        if unlink:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+            _CREATED.discard(self.name)
+
+
+class TickView:
+    """Zero-copy view of one published tick.
+
+    records points into shared memory; call valid() after using it to make
+    sure the writer did not overwrite the slot meanwhile, or copy() it.
+    """
+    __slots__ = ("seq", "step", "t", "records", "_header")
+
+    def __init__(self, seq, header, records):
+        self.seq = seq
+        self._header = header
+        self.step = int(header["step"])
+        self.t = float(header["t"])
+        self.records = records[:int(header["count"])]
+
+    def valid(self):
+        return int(self._header["seq"]) == 2 * self.seq
+
+    def copy(self):
+        """Detached copy of the records, or None if the slot was overwritten."""
+        out = self.records.copy()
+        return out if self.valid() else None
+
+
+class FleetFeedReader:
+    def __init__(self, name="uav_fleet"):
+        self.shm = _attach(name)
+        magic, version, capacity, max_uavs, slot_size, _ = _HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.shm.close()
+            raise ValueError(f"Shared memory {name!r} is not a fleet feed")
+        self.buffer = _FeedBuffer(self.shm, capacity, max_uavs, readonly=True)
+        self.next_seq = int(self.buffer.head[0]) + 1
+        self.dropped = 0
+
+    def head(self):
+        return int(self.buffer.head[0])
+
+    def _view(self, seq):
+        header, records = self.buffer.slots[(seq - 1) % self.buffer.capacity]
+        if int(header["seq"]) != 2 * seq:
+            return None
+        view = TickView(seq, header, records)
+        # The slot may have been rewritten while step/count were read
+        return view if view.valid() else None
+
+    def latest(self):
+        """Most recent complete tick, or None."""
+        head = self.head()
+        for seq in range(head, max(0, head - 2), -1):
+            view = self._view(seq)
+            if view is not None:
+                return view
+        return None
+
+    def poll(self):
+        """Next unread tick, or None if the reader is caught up."""
+        head = self.head()
+        if self.next_seq > head:
+            return None
+        oldest = head - self.buffer.capacity + 1
+        if self.next_seq < oldest:
+            # Lapped by the writer: skip to the oldest tick still in the ring
+            self.dropped += oldest - self.next_seq
+            self.next_seq = oldest
+        while self.next_seq <= self.head():
+            view = self._view(self.next_seq)
+            self.next_seq += 1
+            if view is not None:
+                return view
+            self.dropped += 1
+        return None
+
+    def follow(self, interval=0.001, timeout=None):
+        """Yield ticks as they are published; stops after timeout seconds of silence."""
+        idle_since = time.monotonic()
+        while True:
+            view = self.poll()
+            if view is not None:
+                idle_since = time.monotonic()
+                yield view
+                continue
+            if timeout is not None and time.monotonic() - idle_since > timeout:
+                return
+            time.sleep(interval)
+
+    def close(self):
+        self.buffer.release()
+        self.shm.close()
+
+
+def _attach(name):
+    """Attach to an existing segment without letting this process unlink it at exit."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if name in _CREATED:
+        # Our own writer's segment: the tracker entry is the writer's, leave it alone
+        return shm
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+# -------------------------------
+# Entry Point: tail a running feed
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print ticks from a fleet feed")
+    parser.add_argument("--name", type=str, default="uav_fleet")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    # Wait for the simulation to create the feed
+    deadline = time.monotonic() + args.timeout
+    while True:
+        try:
+            reader = FleetFeedReader(args.name)
+            break
+        except FileNotFoundError:
+            if time.monotonic() > deadline:
+                raise SystemExit(f"No fleet feed named {args.name!r}")
+            time.sleep(0.05)
+    try:
+        for tick in reader.follow(timeout=args.timeout):
+            recs = tick.records
+            flying = int((recs["status"] == STATUS_FLYING).sum())
+            line = f"step {tick.step}: {len(recs)} UAVs, {flying} flying"
+            if tick.valid():
+                print(line)
+        print(f"Done, {reader.dropped} tick(s) dropped")
+    finally:
+        reader.close()
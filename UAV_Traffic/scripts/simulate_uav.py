@@ -1,9 +1,12 @@
 # scripts/simulate_uav.py
 import math
+import time
 import random
 import numpy as np
 import networkx as nx
 from path_planning import compute_path
+from instrumentation import PROFILER
+from congestion import CongestionMap
 
 # -------------------------------
 # Graph generation
@@ -18,10 +21,23 @@ def build_grid_graph(rows, cols):
         G[u][v]["weight"] = 1.0
     return G, pos
 
+def add_nofly_zones(G, percent=0.02):
+    """Randomly mark a percentage of nodes as no-fly zones."""
+    num_nodes = len(G.nodes)
+    nofly_count = max(1,int(num_nodes * percent))
+    nofly_nodes = random.sample(list(G.nodes()), nofly_count)
+    for n in nofly_nodes:
+        G.nodes[n]["nofly"] = True
+    return list(nofly_nodes)
+
 # -------------------------------
 # UAV class
 # -------------------------------
+DEFAULT_ALTITUDE = 100.0
+
 class UAV:
+    altitude = DEFAULT_ALTITUDE  # single-band flight; airspace3d.LayeredUAV tracks its band
+
     def __init__(self, uid, start_node, goal_node, positions, graph, speed=1.5):
         self.id = uid
         self.positions = positions
@@ -36,9 +52,11 @@ class UAV:
         self.pos = np.array(self.positions[start_node], dtype=float)
         self.trajectory = [tuple(self.pos)]
         self.wait_count = 0
+        self.total_wait = 0  # wait ticks over the whole run, never reset
 
-    def compute_path(self, algo='astar'):
-        path = compute_path(self.G, self.positions, self.cur_node, self.goal_node, algo=algo)
+    def compute_path(self, algo='astar', weight='weight'):
+        path = compute_path(self.G, self.positions, self.cur_node, self.goal_node, algo=algo,
+                            weight=weight)
         if path is None:
             self.path_nodes = [self.cur_node]
             self.next_node_index = 0
@@ -65,6 +83,7 @@ class UAV:
         reserved = node_reservation.get(nxt_node)
         if reserved is not None and reserved != self.id:
             self.wait_count += 1
+            self.total_wait += 1
             self.trajectory.append(tuple(self.pos))
             return
 
@@ -95,7 +114,7 @@ class UAV:
             self.pos += (vec / dist) * step
             self.trajectory.append(tuple(self.pos))
 
-    def replan_if_stuck(self, node_reservation, wait_threshold=3):
+    def replan_if_stuck(self, node_reservation, wait_threshold=3, weight='weight'):
         if self.wait_count < wait_threshold:
             return
 
@@ -108,7 +127,8 @@ class UAV:
                 G2.remove_node(n)
 
         for algo in ['astar', 'dijkstra', 'bfs']:
-            path = compute_path(G2, self.positions, self.cur_node, self.goal_node, algo=algo)
+            path = compute_path(G2, self.positions, self.cur_node, self.goal_node, algo=algo,
+                                weight=weight)
             if path:
                 self.path_nodes = path
                 try:
@@ -118,13 +138,139 @@ class UAV:
                 self.wait_count = 0
                 return
 
+# -------------------------------
+# Conflict resolution
+# -------------------------------
+def resolve_conflicts(uavs, desired, cur_occupancy, priority_order):
+    """Decide which UAVs may move to their desired node this tick.
+
+    desired maps uav id -> target node (or None), cur_occupancy maps node -> uav id.
+    Returns the set of uav ids allowed to move; everyone else waits.
+    """
+    # Build node -> list(uav_id) mapping for desired targets
+    targets = {}
+    for uid, node in desired.items():
+        if node is None:
+            continue
+        targets.setdefault(node, []).append(uid)
+
+    # Winners set (uids allowed to move), losers will wait
+    allowed_to_move = set()
+
+    # Handle conflicts for nodes targeted by >1 UAV
+    for node, uids in targets.items():
+        if len(uids) == 1:
+            # single claimant -> allowed (but check further below for occupancy swap)
+            allowed_to_move.add(uids[0])
+        else:
+            # choose winner by priority_order (lowest index first)
+            for p in priority_order:
+                if p in uids:
+                    allowed_to_move.add(p)
+                    break
+            # others are denied (they will wait)
+
+    # Prevent swaps: if A wants B.cur_node and B wants A.cur_node -> allow higher priority only
+    for u in uavs:
+        uid = u.id
+        cand = desired.get(uid)
+        if cand is None:
+            continue
+        occ = cur_occupancy.get(cand)
+        if occ is not None and occ != uid:
+            occ_desired = desired.get(occ)
+            if occ_desired == u.cur_node:
+                if priority_order.index(uid) <= priority_order.index(occ):
+                    allowed_to_move.add(uid)
+                    allowed_to_move.discard(occ)
+                else:
+                    allowed_to_move.add(occ)
+                    allowed_to_move.discard(uid)
+
+    # Nodes that stay occupied by UAVs that are not moving this tick
+    staying_nodes = set()
+    for u in uavs:
+        if u.id not in allowed_to_move:
+            staying_nodes.add(u.cur_node)
+
+    # Nobody moves into a staying node occupied by a higher priority UAV
+    for uid in list(allowed_to_move):
+        target = desired.get(uid)
+        if target in staying_nodes:
+            occupant = cur_occupancy.get(target)
+            if occupant is not None:
+                if priority_order.index(occupant) <= priority_order.index(uid):
+                    allowed_to_move.discard(uid)
+
+    return allowed_to_move
+
 # -------------------------------
 # Simulation helper
 # -------------------------------
-def run_simulation(num_uavs=7, dt=0.25, sim_time=60):
+def run_simulation(num_uavs=7, dt=0.25, sim_time=60, planner_algo="astar", seed=None,
+                   rows=30, cols=30, mode="tick", feed=None,
+                   checkpoint_path=None, checkpoint_every=0, resume_from=None,
+                   congestion=False, stats=None, altitudes=None):
+    """Planner-driven fleet simulation. Returns one snapshot list per tick.
 
-    G, pos = build_grid_graph(rows=30, cols=30)
+    feed is an optional shm_feed.FleetFeedWriter that receives every tick.
+    With checkpoint_path and checkpoint_every=N the full state is saved every
+    N ticks; resume_from continues a saved run with its own parameters
+    (the scenario arguments are ignored) and returns the remaining snapshots;
+    both are tick mode only.
+    congestion=True plans initial routes and stuck replans with congestion-weighted
+    edge costs (tick mode only).
+    stats, if given, is filled with fleet_stats() for the run.
+    altitudes, e.g. (60, 100, 140), flies in a layered airspace with one band
+    per altitude (see airspace3d); not supported with event mode or checkpoints.
+    """
+    if altitudes is not None and (mode == "event" or checkpoint_path or resume_from):
+        raise ValueError("Layered airspace is not supported in event mode or with checkpoints yet")
+    if mode == "event" and (checkpoint_path or resume_from):
+        raise ValueError("Checkpoint and resume are only supported in tick mode")
+    if mode == "event" and congestion:
+        raise ValueError("Congestion-aware planning is only supported in tick mode")
 
+    if resume_from is not None:
+        from checkpoint import load_checkpoint
+        state = load_checkpoint(resume_from)
+        random.setstate(state.rng_state)
+        return run_ticks(state.G, state.uavs, state.params, start_step=state.step + 1,
+                         feed=feed, checkpoint_path=checkpoint_path,
+                         checkpoint_every=checkpoint_every, stats=stats, cmap=state.cmap)
+
+    if mode == "event":
+        # Same scenario, processed as discrete events and sampled every dt
+        from event_sim import run_event_simulation
+        return run_event_simulation(num_uavs=num_uavs, sim_time=sim_time, sample_dt=dt,
+                                    planner_algo=planner_algo, seed=seed, rows=rows, cols=cols,
+                                    feed=feed, stats=stats)
+
+    if seed is not None:
+        random.seed(seed)
+
+    if altitudes is not None:
+        from airspace3d import build_layered_fleet
+        airspace, uavs = build_layered_fleet(num_uavs, rows=rows, cols=cols, altitudes=altitudes)
+        G = airspace.G
+    else:
+        G, pos = build_grid_graph(rows=rows, cols=cols)
+        uavs = _random_fleet(G, pos, num_uavs)
+
+    cmap = CongestionMap() if congestion else None
+    for u in uavs:
+        if cmap is not None:
+            # Each UAV sees the demand of those planned before it
+            u.compute_path(algo=planner_algo, weight=cmap.weight_fn())
+            cmap.add_path(u)
+        else:
+            u.compute_path(algo=planner_algo)
+
+    params = {"dt": dt, "sim_time": sim_time, "planner_algo": planner_algo, "congestion": congestion}
+    return run_ticks(G, uavs, params, feed=feed, checkpoint_path=checkpoint_path,
+                     checkpoint_every=checkpoint_every, stats=stats, cmap=cmap)
+
+def _random_fleet(G, pos, num_uavs):
     candidate_nodes = list(G.nodes())
     starts = random.sample(candidate_nodes, num_uavs)
     goals = []
@@ -133,35 +279,81 @@ def run_simulation(num_uavs=7, dt=0.25, sim_time=60):
         while g == s:
             g = random.choice(candidate_nodes)
         goals.append(g)
+    return [UAV(i, starts[i], goals[i], pos, G, speed=1.2) for i in range(num_uavs)]
 
-    uavs = [UAV(i, starts[i], goals[i], pos, G, speed=1.2) for i in range(num_uavs)]
+def fleet_stats(uavs, ticks, dt):
+    """Throughput (goals reached per simulated minute) and wait totals for a run."""
+    reached = sum(1 for u in uavs if u.reached)
+    minutes = ticks * dt / 60.0
+    return {
+        "uavs": len(uavs),
+        "reached": reached,
+        "ticks": ticks,
+        "goals_per_min": reached / minutes if minutes > 0 else 0.0,
+        "wait_ticks": sum(u.total_wait for u in uavs),
+    }
 
-    steps = int(sim_time / dt)
+def run_ticks(G, uavs, params, start_step=0, feed=None, checkpoint_path=None, checkpoint_every=0,
+              stats=None, cmap=None):
+    """Fixed-dt loop shared by fresh and resumed runs."""
+    dt = params["dt"]
+    steps = int(params["sim_time"] / dt)
     snapshots = []
+    if cmap is None and params.get("congestion"):
+        cmap = CongestionMap()
+
+    checkpointer = None
+    if checkpoint_path and checkpoint_every:
+        from checkpoint import Checkpointer
+        checkpointer = Checkpointer(checkpoint_path, every=checkpoint_every)
+
+    try:
+        for step in range(start_step, steps):
+            tick_start = time.perf_counter()
+            node_reservation = {u.cur_node: u.id for u in uavs if not u.reached}
+            if cmap is not None:
+                with PROFILER.timer("tick.congestion"):
+                    cmap.update(uavs)
+            with PROFILER.timer("tick.move"):
+                for u in uavs:
+                    u.move_step(dt, node_reservation)
+            with PROFILER.timer("tick.replan"):
+                for u in uavs:
+                    # A UAV's own reserved lookahead does not count against it
+                    weight = cmap.weight_fn(exclude=u.id) if cmap is not None else 'weight'
+                    u.replan_if_stuck(node_reservation, weight=weight)
+
+            # Save backend snapshot
+            snapshot = [
+                {
+                    "_id": f"UAV{u.id}",
+                    "status": "flying" if not u.reached else "idle",
+                    "latitude": float(u.pos[0]),
+                    "longitude": float(u.pos[1]),
+                    "altitude": float(u.altitude)
+                }
+                for u in uavs
+            ]
+            snapshots.append(snapshot)
+
+            if feed is not None:
+                with PROFILER.timer("tick.feed"):
+                    feed.publish(step, uavs, t=(step + 1) * dt)
+
+            if checkpointer is not None:
+                with PROFILER.timer("tick.checkpoint"):
+                    checkpointer.maybe_save(step, G, uavs, params, cmap)
+
+            PROFILER.record("tick", tick_start, time.perf_counter())
 
-    for _ in range(steps):
-        node_reservation = {u.cur_node: u.id for u in uavs if not u.reached}
-        for u in uavs:
-            u.move_step(dt, node_reservation)
-        for u in uavs:
-            u.replan_if_stuck(node_reservation)
-
-        # Save backend snapshot
-        snapshot = [
-            {
-                "_id": f"UAV{u.id}",
-                "status": "flying" if not u.reached else "idle",
-                "latitude": float(u.pos[0]),
-                "longitude": float(u.pos[1]),
-                "altitude": 100.0
-            }
-            for u in uavs
-        ]
-        snapshots.append(snapshot)
-
-        if all(u.reached for u in uavs):
-            break
+            if all(u.reached for u in uavs):
+                break
+    finally:
+        if checkpointer is not None:
+            checkpointer.close()
 
+    if stats is not None:
+        stats.update(fleet_stats(uavs, start_step + len(snapshots), dt))
     return snapshots
 
 # -------------------------------
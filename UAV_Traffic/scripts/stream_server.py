@@ -0,0 +1,667 @@
+# scripts/stream_server.py
+"""Push-based live step stream for the frontend (SSE and WebSocket).
+
+The simulation hands each tick to the server in-process; the server encodes
+it once and fans it out to every connected client. There is no database in
+the path and nothing is polled.
+
+Each tick is written straight to every client that keeps up. Once a
+client's socket backs up past `client_buffer` bytes it gets a single
+"latest tick" slot instead: new ticks overwrite the slot, and a small task
+sends whatever is in it when the socket drains. A slow client therefore
+skips intermediate ticks (coalescing) rather than queueing them, and never
+holds up the simulation or the other clients. Clients that stay blocked for
+`send_timeout` seconds are disconnected. Publishing from the simulation
+thread coalesces the same way if the event loop falls behind.
+
+    GET /stream  (or /api/v1/uavs/stream)  text/event-stream, "event: step"
+    GET /ws                                WebSocket, one text message per tick
+    GET /latest                            last tick as plain JSON
+
+    # embedded in a simulation (feed= accepts anything with publish/close)
+    server = StepStreamServer(port=8765).start_in_thread()
+    run_simulation(feed=server)
+    server.close()
+
+    python stream_server.py serve --port 8765 --shm uav_fleet
+    python stream_server.py loadtest --clients 2000 --rate 20 --duration 10
+"""
+import sys
+import json
+import socket
+import time
+import base64
+import struct
+import asyncio
+import hashlib
+import argparse
+import threading
+import concurrent.futures
+
+from backend_connector import build_step_payload
+
+CORS_ORIGIN = "http://localhost:5173"  # default; see StepStreamServer(cors_origin=...)
+SSE_PATHS = ("/stream", "/api/v1/uavs/stream")
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+_OP_TEXT, _OP_CLOSE, _OP_PING, _OP_PONG = 0x1, 0x8, 0x9, 0xA
+_WS_MAX_CLIENT_FRAME = 125          # clients only send control frames (ping/close)
+_WS_MAX_TICK_FRAME = 16 * 1024 * 1024
+_WS_CLOSE_TOO_BIG = 1009
+
+def _ws_frame(opcode, payload=b""):
+    """Unmasked server-to-client frame with FIN set."""
+    n = len(payload)
+    if n < 126:
+        head = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        head = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return head + payload
+
+_SSE_PING = b": ping\n\n"
+_WS_PING = _ws_frame(_OP_PING)
+
+
+class _Frame:
+    """One tick, encoded once and shared by every client."""
+    __slots__ = ("seq", "data", "_sse", "_ws")
+
+    def __init__(self, seq, data):
+        self.seq = seq
+        self.data = data
+        self._sse = None
+        self._ws = None
+
+    @property
+    def sse(self):
+        if self._sse is None:
+            self._sse = b"id: %d\nevent: step\ndata: %s\n\n" % (self.seq, self.data)
+        return self._sse
+
+    @property
+    def ws(self):
+        if self._ws is None:
+            self._ws = _ws_frame(_OP_TEXT, self.data)
+        return self._ws
+
+
+class _Client:
+    """One connection: frames are written straight through until the socket backs up."""
+    __slots__ = ("writer", "transport", "websocket", "pending", "wake", "sent", "skipped",
+                 "blocked_since", "task", "handler")
+
+    def __init__(self, writer, websocket, buffer_limit):
+        self.writer = writer
+        self.transport = writer.transport
+        self.transport.set_write_buffer_limits(high=buffer_limit)
+        sock = self.transport.get_extra_info("socket")
+        if sock is not None:
+            # Bytes parked in the kernel are as stale as bytes in our buffer; keep both small
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_limit)
+        self.websocket = websocket
+        self.pending = None
+        self.wake = asyncio.Event()
+        self.sent = 0
+        self.skipped = 0
+        self.blocked_since = None
+        self.task = None
+        self.handler = asyncio.current_task()
+
+    def push(self, item):
+        if self.blocked_since is None:
+            self._write(item)
+            return
+        # Backed up: keep only the newest tick for when the socket drains
+        if isinstance(item, _Frame):
+            if self.pending is not None:
+                self.skipped += 1
+            self.pending = item
+        elif self.pending is None:
+            self.pending = item
+
+    def _write(self, item):
+        if self.transport.is_closing():
+            return
+        if isinstance(item, _Frame):
+            self.writer.write(item.ws if self.websocket else item.sse)
+            self.sent += 1
+        else:
+            self.writer.write(item)
+        if self.transport.get_write_buffer_size() >= self.transport.get_write_buffer_limits()[1]:
+            self.blocked_since = time.monotonic()
+            self.wake.set()
+
+    async def pump(self):
+        """Runs only while the client is backed up: drain, then send the newest pending tick."""
+        try:
+            while True:
+                await self.wake.wait()
+                self.wake.clear()
+                await self.writer.drain()
+                self.blocked_since = None
+                item, self.pending = self.pending, None
+                if item is not None:
+                    self._write(item)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+
+class StepStreamServer:
+    def __init__(self, host="127.0.0.1", port=8765, heartbeat=15.0, send_timeout=30.0,
+                 client_buffer=32 * 1024, include_paths=True, cors_origin=CORS_ORIGIN):
+        self.host = host
+        self.port = port
+        self.cors_origin = cors_origin
+        self.heartbeat = heartbeat
+        self.send_timeout = send_timeout
+        self.client_buffer = client_buffer
+        self.include_paths = include_paths
+        self.nofly_nodes = []
+        self.clients = set()
+        self.latest = None
+        self.counters = {"published": 0, "broadcast": 0, "connections": 0, "timed_out": 0}
+        self._sent_closed = 0
+        self._skipped_closed = 0
+        self._seq = 0
+        self._loop = None
+        self._server = None
+        self._heartbeat_task = None
+        self._incoming = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = None
+
+    # -------------------------------
+    # Publishing (any thread)
+    # -------------------------------
+    def set_nofly(self, nofly_nodes):
+        self.nofly_nodes = list(nofly_nodes)
+
+    def publish(self, step, uavs, t=0.0, positions=None):
+        """Same signature as FleetFeedWriter.publish, so it can be passed as feed=."""
+        payload = build_step_payload(uavs, step, self.nofly_nodes, include_paths=self.include_paths)
+        payload["t"] = t
+        if positions is not None:
+            for entry, (x, y) in zip(payload["uavs"], positions):
+                entry["x"], entry["y"] = float(x), float(y)
+        self.publish_payload(payload)
+
+    def publish_payload(self, payload):
+        """Encode a step document on the caller's thread and hand it to the event loop."""
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        loop = self._loop
+        if loop is None:
+            raise RuntimeError("Stream server is not running")
+        with self._lock:
+            scheduled = self._incoming is not None
+            self._incoming = data
+            self.counters["published"] += 1
+        # The loop picks up only the newest tick if the publisher outruns it
+        if not scheduled:
+            loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self):
+        with self._lock:
+            data, self._incoming = self._incoming, None
+        if data is None:
+            return
+        self._seq += 1
+        frame = _Frame(self._seq, data)
+        self.latest = frame
+        self.counters["broadcast"] += 1
+        for client in self.clients:
+            client.push(frame)
+
+    # -------------------------------
+    # Lifecycle
+    # -------------------------------
+    async def start(self):
+        """Start listening on the running loop (for embedding in an asyncio app)."""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                  backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        return self
+
+    async def aclose(self):
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+        if self._server is not None:
+            self._server.close()
+        handlers = []
+        for client in list(self.clients):
+            client.transport.abort()
+            handlers.append(client.handler)
+        if handlers:
+            # Let each connection handler see the disconnect and clean up
+            await asyncio.wait(handlers, timeout=1.0)
+        if self._server is not None:
+            await self._server.wait_closed()
+        self._loop = None
+
+    def start_in_thread(self):
+        """Run the server on its own event loop in a daemon thread; returns once listening."""
+        ready = threading.Event()
+        error = []
+
+        async def main():
+            try:
+                await self.start()
+            except Exception as e:
+                error.append(e)
+                ready.set()
+                return
+            self._stopped = asyncio.Event()
+            ready.set()
+            await self._stopped.wait()
+            await self.aclose()
+
+        self._thread = threading.Thread(target=asyncio.run, args=(main(),),
+                                        name="step-stream", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if error:
+            raise error[0]
+        return self
+
+    def close(self):
+        """Stop a server started with start_in_thread."""
+        if self._thread is None:
+            return
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def stats(self):
+        """Counters; `skipped` is ticks coalesced away for backed-up clients.
+
+        Safe from any thread: the clients are only walked on the event loop.
+        """
+        loop = self._loop
+        if loop is None or _running_loop() is loop:
+            return self._stats()
+        result = concurrent.futures.Future()
+
+        def collect():
+            try:
+                result.set_result(self._stats())
+            except Exception as e:
+                result.set_exception(e)
+        try:
+            loop.call_soon_threadsafe(collect)
+        except RuntimeError:
+            # Loop already closed; nothing is changing the clients any more
+            return self._stats()
+        return result.result(timeout=5)
+
+    def _stats(self):
+        sent = self._sent_closed + sum(c.sent for c in self.clients)
+        skipped = self._skipped_closed + sum(c.skipped for c in self.clients)
+        return dict(self.counters, clients=len(self.clients), sent=sent, skipped=skipped,
+                    blocked=sum(1 for c in self.clients if c.blocked_since is not None))
+
+    # -------------------------------
+    # Connections
+    # -------------------------------
+    async def _handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=10)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ConnectionError):
+            writer.close()
+            return
+        method, path, headers = _parse_request(request)
+        path = path.split("?", 1)[0]
+
+        if method != "GET":
+            await _respond(writer, "405 Method Not Allowed", b"", origin=self.cors_origin)
+        elif path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            key = headers.get("sec-websocket-key", "").encode()
+            accept = base64.b64encode(hashlib.sha1(key + _WS_GUID).digest())
+            writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                         b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+            await self._serve_client(reader, writer, websocket=True)
+        elif path in SSE_PATHS:
+            writer.write(("HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                          "Cache-Control: no-cache\r\nConnection: keep-alive\r\n"
+                          f"Access-Control-Allow-Origin: {self.cors_origin}\r\n\r\n").encode())
+            await self._serve_client(reader, writer, websocket=False)
+        elif path == "/latest":
+            body = self.latest.data if self.latest is not None else b"null"
+            await _respond(writer, "200 OK", body, "application/json", origin=self.cors_origin)
+        else:
+            await _respond(writer, "404 Not Found", b"", origin=self.cors_origin)
+
+    async def _serve_client(self, reader, writer, websocket):
+        client = _Client(writer, websocket, self.client_buffer)
+        self.clients.add(client)
+        self.counters["connections"] += 1
+        client.task = asyncio.create_task(client.pump())
+        if self.latest is not None:
+            # Late joiners start from the current state
+            client.push(self.latest)
+        try:
+            if websocket:
+                await self._read_ws(reader, client)
+            else:
+                # SSE is one-way; reading only tells us when the client goes away
+                while await reader.read(1024):
+                    pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clients.discard(client)
+            self._sent_closed += client.sent
+            self._skipped_closed += client.skipped
+            client.task.cancel()
+            writer.close()
+
+    async def _read_ws(self, reader, client):
+        """Handle control frames from a WebSocket client; data frames are ignored."""
+        while True:
+            b1, b2 = await reader.readexactly(2)
+            opcode, n = b1 & 0x0F, b2 & 0x7F
+            if n == 126:
+                n = struct.unpack("!H", await reader.readexactly(2))[0]
+            elif n == 127:
+                n = struct.unpack("!Q", await reader.readexactly(8))[0]
+            if n > _WS_MAX_CLIENT_FRAME:
+                # Never buffer a client-chosen length; drop the connection instead
+                client.writer.write(_ws_frame(_OP_CLOSE, struct.pack("!H", _WS_CLOSE_TOO_BIG)))
+                return
+            mask = await reader.readexactly(4) if b2 & 0x80 else b"\0\0\0\0"
+            payload = bytes(b ^ mask[k % 4] for k, b in enumerate(await reader.readexactly(n)))
+            if opcode == _OP_CLOSE:
+                client.writer.write(_ws_frame(_OP_CLOSE, payload[:2]))
+                return
+            if opcode == _OP_PING:
+                client.push(_ws_frame(_OP_PONG, payload))
+
+    async def _heartbeat_loop(self):
+        interval = min(self.heartbeat, self.send_timeout / 2)
+        last_ping = time.monotonic()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            ping = now - last_ping >= self.heartbeat
+            if ping:
+                last_ping = now
+            for client in list(self.clients):
+                if client.blocked_since is not None and now - client.blocked_since > self.send_timeout:
+                    self.counters["timed_out"] += 1
+                    client.transport.abort()
+                elif ping:
+                    client.push(_WS_PING if client.websocket else _SSE_PING)
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+def _parse_request(raw):
+    lines = raw.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    method, path = (parts[0], parts[1]) if len(parts) >= 2 else ("", "")
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return method, path, headers
+
+async def _respond(writer, status, body, content_type="text/plain", origin=CORS_ORIGIN):
+    writer.write((f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                  f"Content-Length: {len(body)}\r\nAccess-Control-Allow-Origin: {origin}\r\n"
+                  "Connection: close\r\n\r\n").encode() + body)
+    try:
+        await writer.drain()
+    except ConnectionError:
+        pass
+    writer.close()
+
+
+# -------------------------------
+# Bridge from a shared-memory fleet feed
+# -------------------------------
+def bridge_shm_feed(server, name, stop=None):
+    """Republish ticks from a shm_feed ring (e.g. `cli.py simulate --feed NAME`) until stop is set."""
+    from shm_feed import FleetFeedReader, STATUS_REACHED
+    reader = FleetFeedReader(name)
+    try:
+        while stop is None or not stop.is_set():
+            tick = reader.latest()
+            if tick is None or tick.seq < reader.next_seq:
+                time.sleep(0.005)
+                continue
+            reader.next_seq = tick.seq + 1
+            recs = tick.copy()
+            if recs is None:
+                continue
+            server.publish_payload({
+                "step": tick.step,
+                "t": tick.t,
+                "uavs": [{"id": int(r["id"]),
+                          "x": round(float(r["x"]), 4), "y": round(float(r["y"]), 4),
+                          "altitude": round(float(r["alt"]), 2),
+                          "goal": [int(r["goal_r"]), int(r["goal_c"])],
+                          "reached": bool(r["status"] == STATUS_REACHED)} for r in recs],
+                "noFlyZones": server.nofly_nodes,
+            })
+    finally:
+        reader.close()
+
+
+# -------------------------------
+# Load test
+# -------------------------------
+def _payload_field(data, key=b'"ts":'):
+    k = data.find(key) + len(key)
+    end = k
+    while data[end:end + 1] not in (b",", b"}", b""):
+        end += 1
+    return float(data[k:end])
+
+async def _sse_client(port, slow, delay):
+    sock = socket.socket()
+    if slow:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+    reader, writer = await asyncio.open_connection(sock=sock, limit=4096 if slow else 1 << 20)
+    writer.write(b"GET /stream HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+    await reader.readuntil(b"\r\n\r\n")
+    lat = []
+    buf = b""
+    while True:
+        chunk = await reader.read(1024 if slow else 65536)
+        if not chunk:
+            break
+        buf += chunk
+        *events, buf = buf.split(b"\n\n")
+        now = time.time()
+        for ev in events:
+            if b"event: step" in ev:
+                lat.append(now - _payload_field(ev))
+        if slow:
+            await asyncio.sleep(delay)
+    writer.close()
+    return lat
+
+async def _ws_client(port, slow, delay):
+    sock = socket.socket()
+    if slow:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+    reader, writer = await asyncio.open_connection(sock=sock, limit=4096 if slow else 1 << 20)
+    key = base64.b64encode(b"loadtest-key-0000")
+    writer.write(b"GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 b"Sec-WebSocket-Key: " + key + b"\r\nSec-WebSocket-Version: 13\r\n\r\n")
+    await reader.readuntil(b"\r\n\r\n")
+    lat = []
+    try:
+        while True:
+            b1, b2 = await reader.readexactly(2)
+            n = b2 & 0x7F
+            if n == 126:
+                n = struct.unpack("!H", await reader.readexactly(2))[0]
+            elif n == 127:
+                n = struct.unpack("!Q", await reader.readexactly(8))[0]
+            if n > _WS_MAX_TICK_FRAME:
+                break
+            data = await reader.readexactly(n)
+            if b1 & 0x0F == _OP_TEXT:
+                lat.append(time.time() - _payload_field(data))
+                if slow:
+                    await asyncio.sleep(delay)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    writer.close()
+    return lat
+
+async def _run_clients(port, specs, delay):
+    gate = asyncio.Semaphore(64)
+
+    async def one(websocket, slow):
+        async with gate:
+            # Connect in small batches so the listen backlog is not overrun
+            task = asyncio.create_task((_ws_client if websocket else _sse_client)(port, slow, delay))
+            await asyncio.sleep(0.002)
+        try:
+            return websocket, slow, await task
+        except (ConnectionError, OSError):
+            return websocket, slow, None
+
+    return await asyncio.gather(*(one(ws, slow) for ws, slow in specs))
+
+def _client_worker(port, specs, delay, results):
+    results.put(asyncio.run(_run_clients(port, specs, delay)))
+
+def loadtest(clients=1000, ws_ratio=0.5, slow_ratio=0.05, rate=20.0, duration=10.0, uavs=50,
+             procs=2, slow_delay=0.25):
+    """Fan synthetic ticks out to many local SSE/WebSocket clients; returns a summary dict."""
+    import random
+    import statistics
+    import multiprocessing as mp
+    from types import SimpleNamespace
+
+    server = StepStreamServer(port=0, heartbeat=5.0).start_in_thread()
+    rng = random.Random(0)
+    specs = [(rng.random() < ws_ratio, rng.random() < slow_ratio) for _ in range(clients)]
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_client_worker, args=(server.port, specs[k::procs], slow_delay, results))
+               for k in range(procs)]
+    for w in workers:
+        w.start()
+
+    deadline = time.monotonic() + 60
+    while server.stats()["clients"] < clients and time.monotonic() < deadline:
+        time.sleep(0.05)
+    connected = server.stats()["clients"]
+
+    fleet = [SimpleNamespace(id=k, pos=(0.0, 0.0), altitude=100.0, start_node=(0, 0),
+                             goal_node=(k % 30, k // 30), reached=False, path_nodes=[])
+             for k in range(uavs)]
+    publish_cost = []
+    steps = int(rate * duration)
+    start = time.monotonic()
+    for step in range(steps):
+        for u in fleet:
+            u.pos = (rng.uniform(0, 29), rng.uniform(0, 29))
+        t0 = time.perf_counter()
+        payload = build_step_payload(fleet, step, [])
+        payload = {"ts": time.time(), **payload}
+        server.publish_payload(payload)
+        publish_cost.append(time.perf_counter() - t0)
+        time.sleep(max(0.0, start + (step + 1) / rate - time.monotonic()))
+    time.sleep(1.0)
+    stats = server.stats()
+    server.close()
+
+    per_client = [r for _ in workers for r in results.get()]
+    for w in workers:
+        w.join()
+
+    def summarize(rows):
+        got = [r[2] for r in rows if r[2] is not None]
+        if not got:
+            return {"clients": 0}
+        lat = sorted(x for lats in got for x in lats)
+        return {
+            "clients": len(got),
+            "ticks_median": statistics.median(len(l) for l in got),
+            "latency_p50_ms": round(1000 * lat[len(lat) // 2], 2) if lat else None,
+            "latency_p99_ms": round(1000 * lat[int(len(lat) * 0.99)], 2) if lat else None,
+        }
+
+    publish_cost.sort()
+    return {
+        "clients": clients,
+        "connected": connected,
+        "published": steps,
+        "publish_p50_us": round(1e6 * publish_cost[len(publish_cost) // 2], 1),
+        "publish_p99_us": round(1e6 * publish_cost[int(len(publish_cost) * 0.99)], 1),
+        "fast": summarize([r for r in per_client if not r[1]]),
+        "slow": summarize([r for r in per_client if r[1]]),
+        "server": stats,
+    }
+
+
+# -------------------------------
+# Entry Point
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live step stream server (SSE and WebSocket)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="serve ticks from a shared-memory fleet feed")
+    serve.add_argument("--host", type=str, default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--cors-origin", type=str, default=CORS_ORIGIN,
+                       help="Access-Control-Allow-Origin sent to browsers")
+    serve.add_argument("--shm", type=str, default="uav_fleet", help="shm_feed name to republish")
+
+    load = sub.add_parser("loadtest", help="fan out synthetic ticks to many local clients")
+    load.add_argument("--clients", type=int, default=1000)
+    load.add_argument("--ws-ratio", type=float, default=0.5)
+    load.add_argument("--slow-ratio", type=float, default=0.05)
+    load.add_argument("--rate", type=float, default=20.0, help="ticks per second")
+    load.add_argument("--duration", type=float, default=10.0)
+    load.add_argument("--uavs", type=int, default=50)
+    load.add_argument("--procs", type=int, default=2, help="client processes")
+    load.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = StepStreamServer(host=args.host, port=args.port,
+                                  cors_origin=args.cors_origin).start_in_thread()
+        print(f"🚀 Streaming on http://{args.host}:{server.port}/stream and ws://{args.host}:{server.port}/ws")
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                bridge_shm_feed(server, args.shm)
+                break
+            except FileNotFoundError:
+                # Simulation not started yet
+                if time.monotonic() > deadline:
+                    server.close()
+                    sys.exit(f"❌ No fleet feed named {args.shm!r}")
+                time.sleep(0.2)
+            except KeyboardInterrupt:
+                break
+        server.close()
+    else:
+        summary = loadtest(clients=args.clients, ws_ratio=args.ws_ratio, slow_ratio=args.slow_ratio,
+                           rate=args.rate, duration=args.duration, uavs=args.uavs, procs=args.procs)
+        print(json.dumps(summary, indent=2))
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(summary, f, indent=2)
@@ -1,11 +1,15 @@
-import matplotlib.pyplot as plt
 import networkx as nx
 import json
 import os
+import numpy as np
+
+# matplotlib is imported inside the drawing functions so that exporting a
+# graph does not pay for it
 
 def draw_graph_with_path(G, pos, path=None, start=None, goal=None,
                          nofly_nodes=None, ax=None):
     """Draw graph and overlay a path (if provided)."""
+    import matplotlib.pyplot as plt
     if ax is None:
         fig, ax = plt.subplots(figsize=(9,6))
     # base graph
@@ -35,10 +39,156 @@ def draw_graph_with_path(G, pos, path=None, start=None, goal=None,
 
     return ax
 
-def export_graph(G, pos, filepath="graph.json"):
-    """Export graph and no-fly zones to JSON for frontend or visualization."""
-    
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+def _draw_static_airspace(G, pos, ax, labels=True):
+    """Draw the parts of the view that never change during a run."""
+    ax.clear()
+    nx.draw_networkx_edges(G, pos, ax=ax, alpha=0.4)
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=80)
+    if labels:
+        nx.draw_networkx_labels(G, pos, ax=ax, font_size=8)
+    ax.autoscale_view()
+
+class LiveRenderer:
+    """Incremental live view for the simulation loop.
+
+    The airspace (edges, nodes, labels) is drawn once and cached as a blit
+    background; each frame only redraws the no-fly cells, UAV markers, UAV
+    labels and title. With record=True the per-frame state is kept in memory
+    and can be rendered to video afterwards with save_video().
+    """
+
+    def __init__(self, G, pos, ax=None, labels=True, record=False, pause=0.001):
+        import matplotlib.pyplot as plt
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(10, 6))
+        self.G = G
+        self.pos = pos
+        self.ax = ax
+        self.fig = ax.figure
+        self.labels = labels
+        self.pause = pause
+        self.frames = [] if record else None
+        self._nofly = None
+        self._uav_ids = None
+
+        _draw_static_airspace(G, pos, ax, labels)
+        self.nofly_artist = ax.scatter([], [], s=160, color="red", zorder=4, animated=True)
+        self.uav_artist = ax.scatter([], [], s=100, color="blue", zorder=6, animated=True)
+        self.title_artist = ax.text(0.5, 1.01, "", transform=ax.transAxes, ha="center",
+                                    va="bottom", animated=True)
+        self.label_artists = []
+
+        self.canvas = self.fig.canvas
+        self.blit = getattr(self.canvas, "supports_blit", False)
+        self.background = None
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+        plt.show(block=False)
+        self.canvas.draw()
+
+    def _on_draw(self, event):
+        # Re-grab the background after a full redraw (first show, resize, zoom)
+        if self.blit:
+            self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+            self._draw_animated()
+
+    def _draw_animated(self):
+        self.ax.draw_artist(self.nofly_artist)
+        self.ax.draw_artist(self.uav_artist)
+        for t in self.label_artists:
+            self.ax.draw_artist(t)
+        self.ax.draw_artist(self.title_artist)
+
+    def _set_labels(self, uav_ids, xs, ys):
+        if uav_ids != self._uav_ids:
+            for t in self.label_artists:
+                t.remove()
+            self.label_artists = [
+                self.ax.text(0, 0, f"U{uid}", fontsize=8, zorder=7, animated=True)
+                for uid in uav_ids
+            ]
+            self._uav_ids = uav_ids
+        for t, x, y in zip(self.label_artists, xs, ys):
+            t.set_position((x, y + 0.08))
+
+    def update(self, uavs, nofly_nodes=None, title=""):
+        """Draw one frame from the current UAV positions and no-fly set."""
+        xs = [float(u.pos[0]) for u in uavs]
+        ys = [float(u.pos[1]) for u in uavs]
+        uav_ids = [u.id for u in uavs]
+        nofly = frozenset(nofly_nodes or ())
+
+        if nofly != self._nofly:
+            nf = [self.pos[n] for n in nofly if n in self.pos]
+            self.nofly_artist.set_offsets(nf if nf else np.empty((0, 2)))
+            self._nofly = nofly
+        self.uav_artist.set_offsets(np.column_stack([xs, ys]) if xs else np.empty((0, 2)))
+        self._set_labels(uav_ids, xs, ys)
+        self.title_artist.set_text(title)
+
+        if self.frames is not None:
+            self.frames.append((uav_ids, xs, ys, nofly, title))
+
+        if self.blit and self.background is not None:
+            self.canvas.restore_region(self.background)
+            self._draw_animated()
+            self.canvas.blit(self.fig.bbox)
+        else:
+            self.canvas.draw_idle()
+        self.canvas.flush_events()
+        if self.pause:
+            # plt.pause() would force a full redraw and throw the blit away
+            self.canvas.start_event_loop(self.pause)
+
+    def save_video(self, filepath, fps=10):
+        """Render recorded frames to a video/gif (ffmpeg or pillow writer)."""
+        if not self.frames:
+            print("No recorded frames to export")
+            return
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation
+
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        fig, ax = plt.subplots(figsize=self.fig.get_size_inches())
+        _draw_static_airspace(self.G, self.pos, ax, self.labels)
+        nofly_artist = ax.scatter([], [], s=160, color="red", zorder=4)
+        uav_artist = ax.scatter([], [], s=100, color="blue", zorder=6)
+        labels = {}
+
+        def draw_frame(frame):
+            uav_ids, xs, ys, nofly, title = frame
+            nf = [self.pos[n] for n in nofly if n in self.pos]
+            nofly_artist.set_offsets(nf if nf else np.empty((0, 2)))
+            uav_artist.set_offsets(np.column_stack([xs, ys]) if xs else np.empty((0, 2)))
+            for uid, x, y in zip(uav_ids, xs, ys):
+                if uid not in labels:
+                    labels[uid] = ax.text(x, y + 0.08, f"U{uid}", fontsize=8, zorder=7)
+                labels[uid].set_position((x, y + 0.08))
+            ax.set_title(title)
+            return [nofly_artist, uav_artist, *labels.values()]
+
+        writer = "ffmpeg" if not filepath.endswith(".gif") else "pillow"
+        anim = FuncAnimation(fig, draw_frame, frames=self.frames, blit=False)
+        anim.save(filepath, writer=writer, fps=fps)
+        plt.close(fig)
+        print(f"Video exported to {filepath}")
+
+    def close(self):
+        import matplotlib.pyplot as plt
+        plt.close(self.fig)
+
+def export_graph(G, pos, filepath="graph.json", fmt="json", compression="gzip"):
+    """Export graph and no-fly zones for frontend or visualization.
+
+    fmt="binary" writes the compact airspace format (see airspace_io);
+    fmt="json" keeps the verbose node/edge listing.
+    """
+    if fmt == "binary":
+        from airspace_io import export_airspace
+        size = export_airspace(G, filepath, compression=compression)
+        print(f"Graph exported to {filepath} ({size} bytes)")
+        return
+
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
 
     # Collect graph data
     graph_data = {